@@ -1,9 +1,22 @@
 import re
 import os
+import time
+
+from tokenizer import iter_chunk_stats
 
 SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
 WORD_PATTERN = re.compile(r"\b\w+\b")
 
+# scoring parameters shared by every engine; a word is rare when it is
+# longer than RARE_WORD_LEN_OVER characters
+RARE_WORD_LEN_OVER = 7
+RARE_ITERATIONS = 2000
+CHUNK_SENTENCES = 2
+
+# bump when analysis output changes for the same input; cached results
+# are keyed on this plus the parameters above
+ANALYZER_VERSION = f"1:{RARE_WORD_LEN_OVER}:{RARE_ITERATIONS}:{CHUNK_SENTENCES}"
+
 def split_sentences(text: str) -> list[str]:
     return SENTENCE_SPLIT.split(text.strip())
 
@@ -20,23 +33,60 @@ def heavy_sentence_analysis(text_chunk: str) -> dict:
 
     # CPU-bound simulation
     rare_score = 0
-    for _ in range(2000):
-        rare_score += sum(len(w) > 7 for w in words)
+    for _ in range(RARE_ITERATIONS):
+        rare_score += sum(len(w) > RARE_WORD_LEN_OVER for w in words)
 
     return {
         "word_count": len(words),
         "rare_score": rare_score
     }
 
-def analize_content(paragraph: str) -> dict:
-    chunks = sentence_chunker(paragraph, max_sentences=2)
+def fast_sentence_analysis(text_chunk: str) -> dict:
+    """
+    Same result as heavy_sentence_analysis: the rare count does not change
+    between iterations, so it is computed once and multiplied.
+    """
+    words = WORD_PATTERN.findall(text_chunk)
+    rare_count = sum(len(w) > RARE_WORD_LEN_OVER for w in words)
 
+    return {
+        "word_count": len(words),
+        "rare_score": rare_count * RARE_ITERATIONS
+    }
+
+def single_pass_analysis(paragraph: str):
+    """
+    Chunk results computed by the single-pass tokenizer, without
+    materialising sentences, joined chunks or word lists.
+    """
+    for word_count, rare_count in iter_chunk_stats(
+        paragraph, CHUNK_SENTENCES, RARE_WORD_LEN_OVER
+    ):
+        yield {
+            "word_count": word_count,
+            "rare_score": rare_count * RARE_ITERATIONS
+        }
+
+def _chunked(analyse_chunk):
+    def analyse(paragraph: str):
+        for chunk in sentence_chunker(paragraph, max_sentences=CHUNK_SENTENCES):
+            yield analyse_chunk(chunk)
+    return analyse
+
+# engine name -> paragraph -> per-chunk {"word_count", "rare_score"}
+ENGINES = {
+    "reference": _chunked(heavy_sentence_analysis),
+    "fast": _chunked(fast_sentence_analysis),
+    "single-pass": single_pass_analysis,
+}
+DEFAULT_ENGINE = "fast"
+
+def analize_content(paragraph: str, engine: str = DEFAULT_ENGINE) -> dict:
     total_words = 0
     total_rare = 0
     chunk_count = 0
 
-    for chunk in chunks:
-        result = heavy_sentence_analysis(chunk)
+    for result in ENGINES[engine](paragraph):
         total_words += result["word_count"]
         total_rare += result["rare_score"]
         chunk_count += 1
@@ -50,3 +100,22 @@ def analize_content(paragraph: str) -> dict:
         "total_rare_score": total_rare,
         "pid": pid
     }
+
+def analize_batch(paragraphs: list[str], engine: str = DEFAULT_ENGINE) -> list[dict]:
+    """
+    Analyse many paragraphs in one call so a single pool submission
+    (one pickle round-trip) covers the whole batch.
+    """
+    return [analize_content(paragraph, engine) for paragraph in paragraphs]
+
+def timed_analize_batch(
+    paragraphs: list[str],
+    engine: str = DEFAULT_ENGINE,
+) -> tuple[list[dict], float]:
+    """
+    analize_batch plus the seconds spent computing it inside the worker,
+    which excludes pool queueing and IPC and is used for batch sizing.
+    """
+    start = time.perf_counter()
+    results = analize_batch(paragraphs, engine)
+    return results, time.perf_counter() - start
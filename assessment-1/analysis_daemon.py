@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import count
+from pathlib import Path
+
+from analize_content import DEFAULT_ENGINE, ENGINES, timed_analize_batch
+
+DEFAULT_SOCKET = Path("/tmp/movie-analyzer.sock")
+# one request line carries a whole batch of overviews
+LINE_LIMIT = 64 * 1024 * 1024
+
+# Protocol: newline-delimited JSON over a Unix socket. A client may send
+# several requests before reading; responses carry the request id and can
+# arrive in any order.
+#   request:  {"id": 1, "engine": "fast", "overviews": ["...", ...]}
+#   response: {"id": 1, "results": [{...}, ...], "seconds": 0.012}
+#         or  {"id": 1, "error": "..."}
+
+
+class DaemonError(Exception):
+    pass
+
+
+# ============================
+# Server
+# ============================
+
+class AnalysisDaemon:
+    """
+    Keeps a warm ProcessPoolExecutor and analyses batches sent by clients
+    over a Unix socket, so short CLI runs skip pool startup and worker
+    imports. All connections share the pool. If a worker dies, the pool
+    is replaced and the batch retried once, so a crash only fails the
+    requests that were running in it.
+    """
+
+    def __init__(self, socket_path: Path, workers: int) -> None:
+        self.socket_path = socket_path
+        self.workers = workers
+        self.pool: ProcessPoolExecutor | None = None
+        self.requests = 0
+        self.items = 0
+        self.pool_restarts = 0
+
+    def _claim_socket(self) -> None:
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            # left behind by a daemon that did not exit cleanly
+            self.socket_path.unlink()
+            return
+        finally:
+            probe.close()
+        raise DaemonError(f"Another daemon is already listening on {self.socket_path}")
+
+    async def serve(self) -> None:
+        self._claim_socket()
+        loop = asyncio.get_running_loop()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # start every worker now rather than on the first client's batch
+        await asyncio.gather(*(
+            loop.run_in_executor(self.pool, timed_analize_batch, [""], DEFAULT_ENGINE)
+            for _ in range(self.workers)
+        ))
+
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        server = await asyncio.start_unix_server(
+            self._handle, path=str(self.socket_path), limit=LINE_LIMIT
+        )
+        print(f"Analyzer daemon listening on {self.socket_path} with {self.workers} workers")
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            self.pool.shutdown()
+            self.socket_path.unlink(missing_ok=True)
+            print(
+                f"Analyzer daemon stopped after {self.requests} requests ({self.items} overviews, "
+                f"{self.pool_restarts} pool restart(s))"
+            )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        # concurrent requests all see the same broken pool; replace it once
+        if self.pool is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.pool_restarts += 1
+        print(f"Analyzer worker died; started a new pool (restart {self.pool_restarts})")
+
+    async def _analyze(self, overviews: list[str], engine: str) -> tuple[list[dict], float]:
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(pool, timed_analize_batch, overviews, engine)
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+                if attempt:
+                    # broke a fresh pool too: likely this batch; fail only this request
+                    raise
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks: set[asyncio.Task] = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request["id"]
+            engine = request.get("engine", DEFAULT_ENGINE)
+            if engine not in ENGINES:
+                raise ValueError(f"Unknown engine: {engine}")
+            results, seconds = await self._analyze(request["overviews"], engine)
+            response = {"id": request_id, "results": results, "seconds": seconds}
+            self.requests += 1
+            self.items += len(results)
+        except Exception as e:
+            # bad request or a failed batch: report it, keep serving
+            response = {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+# ============================
+# Client
+# ============================
+
+class DaemonClient:
+    """
+    Sends batches to an AnalysisDaemon over one connection. Any number of
+    `analyze` calls may be outstanding; responses are matched by id.
+    """
+
+    def __init__(self, socket_path: Path) -> None:
+        self.socket_path = socket_path
+        self._ids = count()
+        self._waiting: dict[int, asyncio.Future] = {}
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._receiver: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        try:
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                str(self.socket_path), limit=LINE_LIMIT
+            )
+        except OSError as e:
+            raise DaemonError(
+                f"No analyzer daemon on {self.socket_path} ({e.strerror}); "
+                "start one with: python3 analysis_daemon.py"
+            ) from e
+        self._receiver = asyncio.create_task(self._receive())
+
+    async def _receive(self) -> None:
+        error: Exception = DaemonError("Analyzer daemon closed the connection")
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._waiting.pop(response["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(DaemonError(response["error"]))
+                else:
+                    future.set_result((response["results"], response["seconds"]))
+        except (ConnectionError, ValueError) as e:
+            error = DaemonError(f"Lost connection to analyzer daemon: {e}")
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+
+    async def analyze(self, overviews: list[str], engine: str = DEFAULT_ENGINE) -> tuple[list[dict], float]:
+        """Same contract as timed_analize_batch: (results, worker seconds)."""
+        if self._receiver is None or self._receiver.done():
+            raise DaemonError("Not connected to the analyzer daemon")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        request = {"id": request_id, "engine": engine, "overviews": overviews}
+        self._writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._receiver is not None:
+            self._receiver.cancel()
+
+
+# ============================
+# CLI entry point
+# ============================
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Long-lived movie analyzer with a warm process pool (use with main.py --daemon)"
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=DEFAULT_SOCKET,
+        help=f"Unix socket to listen on (default: {DEFAULT_SOCKET})",
+    )
+    cpu = os.cpu_count() or 1
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=cpu,
+        help=f"Number of CPU workers, capped at the CPU count (default: {cpu})",
+    )
+    args = parser.parse_args()
+
+    daemon = AnalysisDaemon(args.socket, min(args.workers, cpu))
+    try:
+        asyncio.run(daemon.serve())
+    except DaemonError as e:
+        parser.exit(1, f"{e}\n")
+
+
+if __name__ == "__main__":
+    main()
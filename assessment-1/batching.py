@@ -0,0 +1,71 @@
+import argparse
+import math
+from dataclasses import dataclass
+
+# auto mode: start small, then size batches so one submission costs ~target
+AUTO_INITIAL_SIZE = 4
+DEFAULT_TARGET_SECONDS = 0.05
+MAX_BATCH_SIZE = 1024
+# weight of the newest per-item measurement in the moving average
+COST_SMOOTHING = 0.3
+# auto mode with a known row count: give every worker at least this many batches
+MIN_BATCHES_PER_WORKER = 4
+
+
+@dataclass
+class BatchSizer:
+    """
+    Decides how many overviews go into one pool submission.
+
+    With auto=False the size never changes. With auto=True every completed
+    batch reports its worker-side compute time, and the size is adjusted so
+    a submission takes about target_seconds of CPU — large enough to
+    amortise pickling/IPC, small enough to keep all workers busy.
+    """
+    size: int = 1
+    auto: bool = False
+    target_seconds: float = DEFAULT_TARGET_SECONDS
+    max_size: int = MAX_BATCH_SIZE
+    per_item_seconds: float | None = None
+
+    def observe(self, items: int, seconds: float) -> None:
+        if not self.auto or items == 0:
+            return
+
+        cost = seconds / items
+        if self.per_item_seconds is None:
+            self.per_item_seconds = cost
+        else:
+            self.per_item_seconds += COST_SMOOTHING * (cost - self.per_item_seconds)
+
+        ideal = self.target_seconds / max(self.per_item_seconds, 1e-9)
+        self.size = max(1, min(self.max_size, int(ideal)))
+
+    def size_for(self, rows: int, workers: int) -> int:
+        """
+        Batch size for `rows` items known up front. In auto mode the size
+        is also capped so every worker gets MIN_BATCHES_PER_WORKER batches;
+        otherwise a small file fits in one batch and runs on one worker.
+        """
+        if not self.auto:
+            return self.size
+        per_worker = math.ceil(rows / (max(1, workers) * MIN_BATCHES_PER_WORKER))
+        return max(1, min(self.size, per_worker))
+
+    @property
+    def capacity(self) -> int:
+        """Largest batch this sizer can ask for."""
+        return self.max_size if self.auto else self.size
+
+
+def parse_batch_size(value: str) -> BatchSizer:
+    """argparse type for --batch-size: a positive integer or 'auto'."""
+    if value == "auto":
+        return BatchSizer(size=AUTO_INITIAL_SIZE, auto=True)
+    try:
+        size = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive integer or 'auto', got {value!r}")
+    if size < 1:
+        raise argparse.ArgumentTypeError("batch size must be >= 1")
+    return BatchSizer(size=size)
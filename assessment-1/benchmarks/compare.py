@@ -0,0 +1,48 @@
+import argparse
+import csv
+from pathlib import Path
+
+KEY_COLUMNS = ("rows", "mode", "workers", "engine", "batch_size")
+
+
+def load(path: Path) -> dict[tuple, dict]:
+    with path.open(encoding="utf-8", newline="") as f:
+        return {tuple(row[c] for c in KEY_COLUMNS): row for row in csv.DictReader(f)}
+
+
+def memory_mb(row: dict) -> str:
+    # results written before the tree total was recorded only have the
+    # largest single process' peak (then named peak_rss_mb)
+    return row.get("peak_total_pss_mb") or row.get("peak_rss_mb", "-")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare two benchmark result files (e.g. from two commits)"
+    )
+    parser.add_argument("baseline", type=Path, help="Results CSV of the baseline commit")
+    parser.add_argument("candidate", type=Path, help="Results CSV of the commit under test")
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+
+    header = (*KEY_COLUMNS, "base rows/s", "new rows/s", "speedup", "base MB", "new MB")
+    print("  ".join(f"{h:>12}" for h in header))
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        old_rate, new_rate = float(old["rows_per_sec"]), float(new["rows_per_sec"])
+        speedup = f"{new_rate / old_rate:.2f}x" if old_rate else "-"
+        cells = (*key, old["rows_per_sec"], new["rows_per_sec"], speedup, memory_mb(old), memory_mb(new))
+        print("  ".join(f"{c:>12}" for c in cells))
+
+    for label, missing in (
+        ("only in baseline", baseline.keys() - candidate.keys()),
+        ("only in candidate", candidate.keys() - baseline.keys()),
+    ):
+        for key in sorted(missing):
+            print(f"{label}: {dict(zip(KEY_COLUMNS, key))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import csv
+import random
+from pathlib import Path
+
+# same columns, in the same order, as the bundled csv/tvcn_vmf1136_*.csv files
+FIELDNAMES = [
+    "Movie Name",
+    "Movie Link",
+    "Fshare Link",
+    "Original Title",
+    "Genre",
+    "Year",
+    "Runtime",
+    "Rating",
+    "Overview",
+    "Poster URL",
+    "Backdrop URL",
+    "TMDB ID",
+]
+
+GENRES = [
+    "Phim Hài", "Phim Nhạc", "Phim Chính Kịch", "Phim Hình Sự", "Phim Bí Ẩn",
+    "Phim Gây Cấn", "Phim Hoạt Hình", "Phim Phiêu Lưu", "Phim Gia Đình",
+    "Phim Giả Tượng", "Phim Lãng Mạn", "Phim Khoa Học Viễn Tưởng",
+    "Action & Adventure", "Sci-Fi & Fantasy",
+]
+
+VI_WORDS = (
+    "một người phụ nữ đàn ông cô gái chàng trai gia đình thành phố thị trấn "
+    "bí mật quá khứ tương lai cuộc sống hành trình chiến đấu sinh tồn bảo vệ "
+    "đối mặt khám phá phát hiện tình yêu tình bạn số phận quyền lực hiểm nguy "
+    "thám tử công tố viên tài xế bác sĩ giáo viên nhà văn nghệ sĩ cảnh sát "
+    "trở về ra đi biến mất xuất hiện thay đổi vượt qua hy vọng duy nhất "
+    "những của và với trong khi sau trước cùng nhau mãi mãi đầy cảm xúc "
+    "Giáng Sinh mùa đông tuyết trắng đêm khuya vương quốc động vật thế giới"
+).split()
+
+EN_WORDS = (
+    "the last night winter house dark secret city love war return "
+    "shadow family dragon fire ash island stranger road home eternity"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(VI_WORDS, k=rng.randint(6, 24))
+    if rng.random() < 0.15:
+        # a long token, so the rare-word count is not always zero
+        words.append("extraordinarily")
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + rng.choice(".!?.")
+
+
+def _overview(rng: random.Random) -> str:
+    sentences = [_sentence(rng) for _ in range(rng.randint(1, 8))]
+    if rng.random() < 0.1:
+        # embedded quotes, escaped as "" in the CSV
+        i = rng.randrange(len(sentences))
+        sentences[i] = f'"{sentences[i]}"'
+    # some overviews span lines inside their quoted field
+    separator = "\n" if rng.random() < 0.1 else " "
+    return separator.join(sentences)
+
+
+def synthetic_row(rng: random.Random, index: int) -> dict[str, str]:
+    en_title = " ".join(w.capitalize() for w in rng.choices(EN_WORDS, k=rng.randint(1, 4)))
+    vi_title = " ".join(w.capitalize() for w in rng.choices(VI_WORDS, k=rng.randint(2, 5)))
+    year = rng.randint(1970, 2026)
+    slug = f"phim-{index}-{year}-fshare"
+    has_runtime = rng.random() < 0.7
+    has_rating = rng.random() < 0.95
+
+    return {
+        "Movie Name": f"{en_title} - {vi_title} - ({year})",
+        "Movie Link": f"https://thuviencine.com/{slug}/",
+        "Fshare Link": f"https://www.fshare.vn/folder/SYN{index:09d}",
+        "Original Title": en_title,
+        "Genre": ", ".join(rng.sample(GENRES, rng.randint(1, 4))),
+        "Year": str(year),
+        "Runtime": f"{rng.randint(60, 200)} phút" if has_runtime else "",
+        "Rating": f"{rng.uniform(1, 10):.1f}" if has_rating else "",
+        "Overview": _overview(rng),
+        "Poster URL": f"https://image.tmdb.org/t/p/w500/syn{index}.jpg",
+        "Backdrop URL": f"https://image.tmdb.org/t/p/original/syn{index}.jpg",
+        "TMDB ID": str(1_000_000 + index),
+    }
+
+
+def generate_csv(path: Path, rows: int, seed: int = 0) -> Path:
+    """Write `rows` synthetic movies to `path`; the same seed gives the same file."""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow(synthetic_row(rng, i))
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic movie CSV matching the real schema"
+    )
+    parser.add_argument("output", type=Path, help="CSV file to write")
+    parser.add_argument("--rows", type=int, default=10_000, help="Number of movies (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    generate_csv(args.output, args.rows, args.seed)
+    print(f"Wrote {args.rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
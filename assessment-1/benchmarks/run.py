@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.generate import generate_csv
+from sink_stub import StubSinkServer
+
+ASSESSMENT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = Path(__file__).resolve().parent / "data"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# seconds between samples of the run's process tree memory
+MEMORY_SAMPLE_INTERVAL = 0.05
+
+MODE_FLAGS = {
+    "gather": [],
+    "stream": ["--stream"],
+    "parallel-parse": ["--parallel-parse"],
+}
+COLUMNS = [
+    "commit",
+    "rows",
+    "mode",
+    "workers",
+    "effective_workers",
+    "engine",
+    "batch_size",
+    "exit_code",
+    "wall_seconds",
+    "rows_per_sec",
+    "max_process_rss_mb",
+    "peak_total_pss_mb",
+    "cpu_seconds",
+    "cpu_efficiency",
+]
+
+
+# ============================
+# Helpers
+# ============================
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ASSESSMENT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def dataset(rows: int, seed: int) -> Path:
+    """Synthetic CSV with `rows` movies, generated once and reused."""
+    path = DATA_DIR / f"synthetic_{rows}_seed{seed}.csv"
+    if not path.exists():
+        print(f"Generating {path} ...", file=sys.stderr)
+        generate_csv(path, rows, seed)
+    return path
+
+
+class StubSinkThread:
+    """
+    Runs a zero-latency StubSinkServer on a background event loop, so runs
+    measure the analyzer rather than the 100 ms mock logger.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.server = StubSinkServer(latency=0.0)
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> "StubSinkThread":
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def _process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    for parent in pids:
+        for task in Path(f"/proc/{parent}/task").glob("*"):
+            try:
+                pids.extend(int(child) for child in (task / "children").read_text().split())
+            except OSError:
+                pass
+    return pids
+
+
+def tree_pss_kib(pid: int) -> int | None:
+    """
+    PSS of a process and its descendants, in KiB; None without /proc.
+    PSS splits shared pages between the processes mapping them, so forked
+    pool workers are not counted twice for the parent's pages.
+    """
+    total = 0
+    for p in _process_tree(pid):
+        try:
+            for line in Path(f"/proc/{p}/smaps_rollup").read_text().splitlines():
+                if line.startswith("Pss:"):
+                    total += int(line.split()[1])
+                    break
+        except (OSError, ValueError):
+            if p == pid:
+                return None
+    return total
+
+
+class TreeMemorySampler:
+    """Tracks the peak total PSS of a process tree from a background thread."""
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.peak_kib: int | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while True:
+            kib = tree_pss_kib(self.pid)
+            if kib is not None:
+                self.peak_kib = max(self.peak_kib or 0, kib)
+            if self._stop.wait(MEMORY_SAMPLE_INTERVAL):
+                return
+
+    def __enter__(self) -> "TreeMemorySampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+# ============================
+# Single run
+# ============================
+
+def run_once(
+    csv_path: Path,
+    rows: int,
+    mode: str,
+    workers: int,
+    engine: str,
+    batch_size: str,
+    sink_url: str,
+) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = Path(tmp) / "report.json"
+        cmd = [
+            sys.executable,
+            str(ASSESSMENT_DIR / "main.py"),
+            str(csv_path),
+            "--workers", str(workers),
+            "--engine", engine,
+            "--sink-url", sink_url,
+            "--report", str(report_path),
+            *MODE_FLAGS[mode],
+        ]
+        if mode != "parallel-parse":
+            cmd += ["--batch-size", batch_size]
+
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=ASSESSMENT_DIR, stdout=subprocess.DEVNULL)
+        with TreeMemorySampler(proc.pid) as memory:
+            # wait4 reports the child's usage including its reaped pool workers
+            _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        report = json.loads(report_path.read_text()) if report_path.exists() else {}
+
+    run = report.get("run", {})
+    cpu_seconds = usage.ru_utime + usage.ru_stime
+    effective_workers = run.get("workers", workers)
+    return {
+        "rows": rows,
+        "mode": mode,
+        "workers": workers,
+        # main.py clamps workers to the CPU count
+        "effective_workers": effective_workers,
+        "engine": engine,
+        "batch_size": batch_size if mode != "parallel-parse" else "-",
+        "exit_code": proc.returncode,
+        "wall_seconds": round(wall, 3),
+        "rows_per_sec": round(run.get("rows", 0) / wall, 1),
+        # ru_maxrss (KiB on Linux) is the largest single process' peak,
+        # the parent's or one worker's, not their sum
+        "max_process_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        # whole tree, sampled: a peak shorter than the interval can be missed
+        "peak_total_pss_mb": "-" if memory.peak_kib is None else round(memory.peak_kib / 1024, 1),
+        "cpu_seconds": round(cpu_seconds, 3),
+        # 1.0 means every worker was busy for the whole run
+        "cpu_efficiency": round(cpu_seconds / (wall * effective_workers), 3),
+    }
+
+
+# ============================
+# Matrix
+# ============================
+
+def print_table(results: list[dict]) -> None:
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in COLUMNS}
+    print("  ".join(c.rjust(widths[c]) for c in COLUMNS))
+    for r in results:
+        print("  ".join(str(r[c]).rjust(widths[c]) for c in COLUMNS))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark assessment-1/main.py on synthetic CSVs"
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000], help="Dataset sizes (default: 10000)")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=sorted(MODE_FLAGS),
+        default=["stream", "parallel-parse"],
+        help="Processing modes (default: stream parallel-parse)",
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts (default: 1 2 4)")
+    parser.add_argument("--engines", nargs="+", default=["fast"], help="Analysis engines (default: fast)")
+    parser.add_argument("--batch-sizes", nargs="+", default=["1", "64", "auto"], help="Batch sizes (default: 1 64 auto)")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed (default: 0)")
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help=f"Results CSV (default: {RESULTS_DIR.relative_to(ASSESSMENT_DIR)}/<commit>.csv)",
+    )
+    args = parser.parse_args()
+
+    commit = git_commit()
+    out = args.out or RESULTS_DIR / f"{commit}.csv"
+    results: list[dict] = []
+
+    with StubSinkThread() as stub:
+        for rows, mode, workers, engine in itertools.product(
+            args.rows, args.modes, args.workers, args.engines
+        ):
+            csv_path = dataset(rows, args.seed)
+            # parallel-parse ignores --batch-size; run it once
+            batch_sizes = ["-"] if mode == "parallel-parse" else args.batch_sizes
+            for batch_size in batch_sizes:
+                result = {"commit": commit, **run_once(
+                    csv_path, rows, mode, workers, engine, batch_size, stub.server.url
+                )}
+                results.append(result)
+                print(
+                    f"rows={rows} mode={mode} workers={workers} engine={engine} "
+                    f"batch={batch_size}: {result['rows_per_sec']} rows/s",
+                    file=sys.stderr,
+                )
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print_table(results)
+    print(f"\nResults written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import csv
+import time
+import tracemalloc
+from pathlib import Path
+
+from analize_content import ENGINES, analize_content
+
+DEFAULT_CSV_DIR = Path(__file__).resolve().parent.parent / "csv"
+DEFAULT_ENGINES = ("fast", "single-pass")
+
+
+def load_overviews(paths: list[Path]) -> list[str]:
+    overviews: list[str] = []
+    for path in paths:
+        with path.open(encoding="utf-8", newline="") as f:
+            overviews.extend(row["Overview"].strip() for row in csv.DictReader(f))
+    return overviews
+
+
+def time_per_overview(overviews: list[str], engine: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for overview in overviews:
+            analize_content(overview, engine)
+    return (time.perf_counter() - start) / (repeat * len(overviews))
+
+
+def peak_bytes_per_overview(overviews: list[str], engine: str) -> tuple[float, int]:
+    """Mean and max transient memory (tracemalloc peak) of one analysis."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for overview in overviews:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            analize_content(overview, engine)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks), max(peaks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time and transient memory per overview for each tokenizer path"
+    )
+    parser.add_argument(
+        "csv_files",
+        type=Path,
+        nargs="*",
+        help=f"CSV files to read overviews from (default: {DEFAULT_CSV_DIR}/*.csv)",
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=sorted(ENGINES),
+        default=list(DEFAULT_ENGINES),
+        help=f"Engines to compare (default: {' '.join(DEFAULT_ENGINES)})",
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="Timing passes over all overviews (default: 200)")
+    args = parser.parse_args()
+
+    overviews = load_overviews(args.csv_files or sorted(DEFAULT_CSV_DIR.glob("*.csv")))
+    print(f"{len(overviews)} overviews, mean length {sum(map(len, overviews)) / len(overviews):.0f} chars\n")
+    print(f"{'engine':>12} {'us/overview':>12} {'mean peak B':>12} {'max peak B':>12}")
+
+    for engine in args.engines:
+        seconds = time_per_overview(overviews, engine, args.repeat)
+        mean_peak, max_peak = peak_bytes_per_overview(overviews, engine)
+        print(f"{engine:>12} {seconds * 1e6:>12.2f} {mean_peak:>12.0f} {max_peak:>12}")
+
+
+if __name__ == "__main__":
+    main()
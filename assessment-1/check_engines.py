@@ -0,0 +1,64 @@
+import argparse
+import csv
+import sys
+from pathlib import Path
+
+from analize_content import ENGINES, analize_content
+
+DEFAULT_CSV_DIR = Path(__file__).parent / "csv"
+COMPARED_KEYS = ("chunk_count", "total_words", "total_rare_score")
+
+
+# ============================
+# Engine parity check
+# ============================
+
+def check_file(path: Path) -> list[str]:
+    """
+    Run every engine over each overview in the CSV and return a message
+    for every row where an engine disagrees with the reference.
+    """
+    mismatches: list[str] = []
+
+    with path.open(encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            overview = row["Overview"].strip()
+            expected = analize_content(overview, "reference")
+
+            for engine in ENGINES:
+                result = analize_content(overview, engine)
+                for key in COMPARED_KEYS:
+                    if result[key] != expected[key]:
+                        mismatches.append(
+                            f"{path.name} tmdb_id={row['TMDB ID']} engine={engine} "
+                            f"{key}: {result[key]} != {expected[key]}"
+                        )
+
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that every analysis engine matches the reference engine"
+    )
+    parser.add_argument(
+        "csv_files",
+        type=Path,
+        nargs="*",
+        help=f"CSV files to check (default: {DEFAULT_CSV_DIR}/tvcn_vmf1136_*.csv)",
+    )
+    args = parser.parse_args()
+
+    paths = args.csv_files or sorted(DEFAULT_CSV_DIR.glob("tvcn_vmf1136_*.csv"))
+    mismatches: list[str] = []
+    for path in paths:
+        mismatches.extend(check_file(path))
+
+    for line in mismatches:
+        print(line)
+    print(f"Checked {len(paths)} file(s), engines={sorted(ENGINES)}: {len(mismatches)} mismatch(es)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
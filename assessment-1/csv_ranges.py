@@ -0,0 +1,102 @@
+import csv
+import io
+import mmap
+import time
+from pathlib import Path
+
+from analize_content import DEFAULT_ENGINE, analize_batch
+from models import Movie, parse_movie_row
+
+# target bytes per range; small enough to balance load and bound memory
+DEFAULT_RANGE_BYTES = 4 * 1024 * 1024
+# quote parity is counted over blocks of this size
+_SCAN_BLOCK = 1024 * 1024
+
+
+# ============================
+# Record-aligned byte ranges
+# ============================
+
+def _next_record_start(mm: mmap.mmap, pos: int, quotes_before: int) -> tuple[int, int]:
+    """
+    First record boundary at or after `pos`, and the number of quote
+    characters before it.
+
+    In RFC 4180 CSV a position is inside a quoted field exactly when an odd
+    number of `"` precede it (escaped quotes come in pairs), so a newline
+    only ends a record when the running quote count is even.
+    """
+    while True:
+        nl = mm.find(b"\n", pos)
+        if nl == -1:
+            return len(mm), quotes_before
+        quotes_before += mm[pos:nl].count(b'"')
+        pos = nl + 1
+        if quotes_before % 2 == 0:
+            return pos, quotes_before
+
+
+def _count_quotes(mm: mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for block in range(start, end, _SCAN_BLOCK):
+        count += mm[block:min(block + _SCAN_BLOCK, end)].count(b'"')
+    return count
+
+
+def split_record_ranges(
+    path: Path,
+    range_bytes: int = DEFAULT_RANGE_BYTES,
+) -> tuple[list[str], list[tuple[int, int]]]:
+    """
+    Memory-map the CSV and return its header plus (start, end) byte ranges
+    covering every data record, each range starting and ending on a record
+    boundary, including when quoted fields span multiple lines.
+    """
+    with path.open("rb") as f:
+        if path.stat().st_size == 0:
+            return [], []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            data_start, quotes = _next_record_start(mm, 0, 0)
+            header = next(csv.reader([mm[:data_start].decode("utf-8-sig")]))
+
+            ranges: list[tuple[int, int]] = []
+            start = data_start
+            while start < size:
+                target = min(start + range_bytes, size)
+                quotes += _count_quotes(mm, start, target)
+                end, quotes = _next_record_start(mm, target, quotes)
+                ranges.append((start, end))
+                start = end
+
+    return header, ranges
+
+
+# ============================
+# Worker entry point
+# ============================
+
+def analyze_range(
+    path: str,
+    start: int,
+    end: int,
+    header: list[str],
+    engine: str = DEFAULT_ENGINE,
+) -> tuple[list[tuple[Movie, dict]], float, float]:
+    """
+    Parse and analyse the records in bytes [start, end) of the CSV.
+    Returns (movie, result) pairs plus the seconds spent parsing and
+    analysing inside the worker.
+    """
+    parse_start = time.perf_counter()
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = mm[start:end].decode("utf-8")
+
+    reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=header)
+    movies = [parse_movie_row(row) for row in reader]
+
+    analyze_start = time.perf_counter()
+    results = analize_batch([movie.overview for movie in movies], engine)
+    done = time.perf_counter()
+    return list(zip(movies, results)), analyze_start - parse_start, done - analyze_start
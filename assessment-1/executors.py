@@ -0,0 +1,122 @@
+import concurrent.futures
+import sys
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from analize_content import DEFAULT_ENGINE, timed_analize_batch
+
+EXECUTORS = ("process", "thread", "inline", "subinterpreter")
+DEFAULT_EXECUTOR = "process"
+# rows analysed by each candidate during --executor auto
+DEFAULT_CALIBRATION_ROWS = 64
+
+# Python 3.14+: one interpreter (with its own GIL) per worker thread
+InterpreterPoolExecutor = getattr(concurrent.futures, "InterpreterPoolExecutor", None)
+
+
+class InlineExecutor(Executor):
+    """
+    Runs each call synchronously in the caller's thread. No pool startup,
+    pickling or thread hand-off: the cheapest option for tiny inputs, at
+    the cost of blocking the event loop while a batch is analysed.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def free_threaded() -> bool:
+    """True on a free-threaded (no-GIL) CPython build with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def available_executors() -> list[str]:
+    return [kind for kind in EXECUTORS if kind != "subinterpreter" or InterpreterPoolExecutor]
+
+
+def create_executor(kind: str, workers: int, initializer=None, initargs: tuple = ()) -> Executor:
+    """`initializer(*initargs)` runs once per pool worker; inline has no workers."""
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    if kind == "inline":
+        return InlineExecutor()
+    if kind == "subinterpreter":
+        if InterpreterPoolExecutor is None:
+            raise ValueError("Sub-interpreter executor needs Python 3.14+")
+        return InterpreterPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    raise ValueError(f"Unknown executor: {kind}")
+
+
+# ============================
+# --executor auto
+# ============================
+
+def calibration_candidates(workers: int) -> list[str]:
+    candidates = ["inline"]
+    # with the GIL, threads only add hand-off cost to CPU-bound analysis
+    if workers > 1 and free_threaded():
+        candidates.append("thread")
+    if InterpreterPoolExecutor is not None:
+        candidates.append("subinterpreter")
+    candidates.append("process")
+    return candidates
+
+
+def _seconds_per_item(pool: Executor, overviews: list[str], workers: int, engine: str) -> float:
+    size = -(-len(overviews) // workers)
+    start = time.perf_counter()
+    futures = [
+        pool.submit(timed_analize_batch, overviews[i:i + size], engine)
+        for i in range(0, len(overviews), size)
+    ]
+    for future in futures:
+        future.result()
+    return (time.perf_counter() - start) / len(overviews)
+
+
+def calibrate(
+    overviews: list[str],
+    workers: int,
+    engine: str = DEFAULT_ENGINE,
+    total_rows: int | None = None,
+    initializer=None,
+    initargs: tuple = (),
+) -> tuple[str, Executor, dict[str, float]]:
+    """
+    Analyse `overviews` (the first rows of the input) on every candidate
+    backend and return the fastest as (kind, executor, seconds per item by
+    kind); the losing executors are shut down.
+
+    Pool startup is excluded from the per-item time, since it is paid during
+    calibration anyway. When the whole input is no larger than the sample,
+    no pool can earn back its startup, so inline is picked without measuring.
+    """
+    if not overviews or (total_rows is not None and total_rows <= len(overviews)):
+        return "inline", InlineExecutor(), {}
+
+    timings: dict[str, float] = {}
+    pools: dict[str, Executor] = {}
+    try:
+        for kind in calibration_candidates(workers):
+            pool = pools[kind] = create_executor(kind, workers, initializer, initargs)
+            # warm up: start the workers and import the analyser in them
+            pool.submit(timed_analize_batch, overviews[:1], engine).result()
+            timings[kind] = _seconds_per_item(pool, overviews, workers, engine)
+    except BaseException:
+        for pool in pools.values():
+            pool.shutdown()
+        raise
+
+    best = min(timings, key=timings.get)
+    for kind, pool in pools.items():
+        if kind != best:
+            pool.shutdown()
+    return best, pools[best], timings
@@ -2,41 +2,55 @@ import argparse
 import os
 import asyncio
 import csv
-from concurrent.futures import ProcessPoolExecutor
-from dataclasses import dataclass
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from analize_content import analize_content
-
-@dataclass(frozen=True)
-class Movie:
-    movie_name: str
-    movie_link: str
-    fshare_link: str
-    original_title: str
-    genre: str
-    year: int
-    runtime: str
-    rating: float
-    overview: str
-    poster_url: str
-    backdrop_url: str
-    tmdb_id: str
-
-def parse_movie_row(row: dict[str, str]) -> Movie:
-    return Movie(
-        movie_name=row["Movie Name"].strip(),
-        movie_link=row["Movie Link"].strip(),
-        fshare_link=row["Fshare Link"].strip(),
-        original_title=row["Original Title"].strip(),
-        genre=row["Genre"].strip(),
-        year=int(row["Year"]),
-        runtime=row["Runtime"].strip(),
-        rating=float(row["Rating"].strip()) if row["Rating"].strip() else 0.0,
-        overview=row["Overview"].strip(),
-        poster_url=row["Poster URL"].strip(),
-        backdrop_url=row["Backdrop URL"].strip(),
-        tmdb_id=row["TMDB ID"].strip(),
-    )
+from analize_content import ENGINES, DEFAULT_ENGINE, timed_analize_batch
+from batching import BatchSizer, parse_batch_size
+from result_cache import DEFAULT_MAX_ENTRIES as DEFAULT_CACHE_ENTRIES, ResultCache
+from result_sink import (
+    DEFAULT_BATCH_SIZE as DEFAULT_SINK_BATCH_SIZE,
+    DEFAULT_CONCURRENCY as DEFAULT_SINK_CONCURRENCY,
+    DEFAULT_FLUSH_INTERVAL as DEFAULT_SINK_FLUSH_INTERVAL,
+    DEFAULT_TIMEOUT as DEFAULT_SINK_TIMEOUT,
+    ResultSink,
+)
+from csv_ranges import DEFAULT_RANGE_BYTES, analyze_range, split_record_ranges
+from metrics import PipelineMetrics
+from models import Movie, parse_movie_row
+from shm_transport import ArenaPool, analyze_shared
+from result_writer import FORMATS as OUTPUT_FORMATS, ORDERS as OUTPUT_ORDERS, ResultWriter
+from analysis_daemon import DEFAULT_SOCKET, DaemonClient, DaemonError
+from profiling import RunProfiler
+from executors import (
+    DEFAULT_CALIBRATION_ROWS,
+    DEFAULT_EXECUTOR,
+    available_executors,
+    calibrate,
+    create_executor,
+)
+
+
+# ============================
+# Run configuration
+# ============================
+
+@dataclass
+class RunContext:
+    """Everything the processing stages share for one run."""
+    # None in --daemon mode, where the daemon's pool does the analysis
+    pool: Executor | None
+    engine: str = DEFAULT_ENGINE
+    sizer: BatchSizer = field(default_factory=BatchSizer)
+    sink: ResultSink | None = None
+    cache: ResultCache | None = None
+    metrics: PipelineMetrics = field(default_factory=PipelineMetrics)
+    arenas: ArenaPool | None = None
+    writer: ResultWriter | None = None
+    daemon: DaemonClient | None = None
+
 
 # ============================
 # Async mock API logger
@@ -47,55 +61,472 @@ async def log_movie_result(movie: Movie, result: dict) -> None:
     print(f"Movie={movie.original_title} → {result}")
 
 
+async def emit_result(movie: Movie, result: dict, ctx: RunContext) -> None:
+    start = time.perf_counter()
+    # output file or batched HTTP sink when configured, otherwise the
+    # per-row mock logger
+    if ctx.writer is not None:
+        await ctx.writer.write(movie, result)
+    elif ctx.sink is not None:
+        await ctx.sink.submit(
+            {"tmdb_id": movie.tmdb_id, "original_title": movie.original_title, **result}
+        )
+    else:
+        await log_movie_result(movie, result)
+    ctx.metrics.stage("emit").record(time.perf_counter() - start)
+
+
 # ============================
 # Row processing
 # ============================
 
-async def process_movie_row(
-    movie: Movie,
-    pool: ProcessPoolExecutor,
-) -> None:
+def cached_result(values: dict) -> dict:
+    # no worker ran for a cache hit
+    return {**values, "pid": None, "cached": True}
+
+
+def parse_timed(row: dict[str, str], ctx: RunContext) -> Movie:
+    start = time.perf_counter()
+    movie = parse_movie_row(row)
+    if ctx.writer is not None:
+        # rows are parsed in file order: their output position for --output-order ordered
+        ctx.writer.reserve(movie)
+    ctx.metrics.stage("parse").record(time.perf_counter() - start)
+    return movie
+
+
+async def analyze_in_arena(overviews: list[str], ctx: RunContext) -> tuple[list[dict], float]:
+    # only the arena name and item count are pickled to the worker
     loop = asyncio.get_running_loop()
+    arena, count = ctx.arenas.acquire(overviews)
+    try:
+        seconds = await loop.run_in_executor(
+            ctx.pool,
+            analyze_shared,
+            arena.name,
+            count,
+            ctx.engine,
+        )
+        results = arena.read_results(count)
+    except BaseException:
+        # a worker may still be writing into it; never hand it out again
+        arena.destroy()
+        raise
+    ctx.arenas.release(arena)
+    return results, seconds
+
 
-    # CPU-bound work → process pool (process_paragraph now accepts Movie)
-    result = await loop.run_in_executor(
-        pool,
-        analize_content,
-        movie.overview,
+async def analyze_movie_batch(movies: list[Movie], ctx: RunContext) -> list[dict]:
+    overviews = [movie.overview for movie in movies]
+    results: list[dict | None] = [None] * len(movies)
+
+    if ctx.cache is not None:
+        start = time.perf_counter()
+        for i, hit in enumerate(await ctx.cache.get_many(overviews)):
+            if hit is not None:
+                results[i] = cached_result(hit)
+        ctx.metrics.stage("cache_lookup").record(time.perf_counter() - start, len(movies))
+
+    # only cache misses go to the pool
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        loop = asyncio.get_running_loop()
+        todo = [overviews[i] for i in missing]
+
+        # one submission (one pickle round-trip) for the whole batch
+        start = time.perf_counter()
+        if ctx.daemon is not None:
+            computed, seconds = await ctx.daemon.analyze(todo, ctx.engine)
+        elif ctx.arenas is not None:
+            computed, seconds = await analyze_in_arena(todo, ctx)
+        else:
+            computed, seconds = await loop.run_in_executor(
+                ctx.pool,
+                timed_analize_batch,
+                todo,
+                ctx.engine,
+            )
+        # cpu = submit-to-result in the parent (includes pool queueing and
+        # IPC); worker_compute = time actually spent analysing in the worker
+        ctx.metrics.stage("cpu").record(time.perf_counter() - start, len(todo))
+        ctx.metrics.stage("worker_compute").record(seconds, len(todo))
+        ctx.metrics.record_worker(computed[0]["pid"], len(todo), seconds)
+
+        ctx.sizer.observe(len(todo), seconds)
+        if ctx.cache is not None:
+            await ctx.cache.put_many(todo, computed)
+        for i, result in zip(missing, computed):
+            results[i] = result
+
+    return results
+
+
+async def process_movie_batch(movies: list[Movie], ctx: RunContext) -> None:
+    results = await analyze_movie_batch(movies, ctx)
+    await asyncio.gather(
+        *(emit_result(movie, result, ctx) for movie, result in zip(movies, results))
     )
 
-    # Async I/O
-    await log_movie_result(movie, result)
+
+async def process_movie_row(movie: Movie, ctx: RunContext) -> None:
+    # CPU-bound work → process pool, one overview per submission
+    await process_movie_batch([movie], ctx)
+
+
+# ============================
+# Streaming pipeline
+# ============================
+
+# default queue depth per worker when --max-inflight is not given
+DEFAULT_INFLIGHT_PER_WORKER = 2
+
+# marks the end of a pipeline queue
+_END = None
+
+
+async def read_stage(
+    path: Path,
+    rows: asyncio.Queue,
+    consumers: int,
+    ctx: RunContext,
+) -> None:
+    put_wait = ctx.metrics.stage("rows_put_wait")
+
+    with path.open(encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+
+        for row in reader:
+            movie = parse_timed(row, ctx)
+            ctx.metrics.sample_queue("rows", rows)
+            # blocks here while the CPU stage is max_inflight rows behind
+            start = time.perf_counter()
+            await rows.put(movie)
+            put_wait.record(time.perf_counter() - start)
+
+    for _ in range(consumers):
+        await rows.put(_END)
+
+
+async def cpu_stage(rows: asyncio.Queue, results: asyncio.Queue, ctx: RunContext) -> None:
+    get_wait = ctx.metrics.stage("rows_get_wait")
+
+    while True:
+        # take whatever is already queued, up to the current batch size
+        start = time.perf_counter()
+        batch = [await rows.get()]
+        get_wait.record(time.perf_counter() - start)
+        while len(batch) < ctx.sizer.size and batch[-1] is not _END and not rows.empty():
+            batch.append(rows.get_nowait())
+
+        finished = batch[-1] is _END
+        if finished:
+            batch.pop()
+
+        if batch:
+            analysed = await analyze_movie_batch(batch, ctx)
+            for item in zip(batch, analysed):
+                ctx.metrics.sample_queue("results", results)
+                await results.put(item)
+
+        if finished:
+            return
+
+
+async def log_stage(results: asyncio.Queue, ctx: RunContext) -> None:
+    while (item := await results.get()) is not _END:
+        await emit_result(*item, ctx)
+
+
+async def stream_csv(path: Path, ctx: RunContext, max_inflight: int) -> None:
+    """
+    reader -> CPU stage -> logging stage, connected by bounded queues.
+    There are max_inflight CPU consumers each submitting one batch at a
+    time, so the pool never holds more than max_inflight outstanding jobs
+    and memory stays flat regardless of file size.
+    """
+    # deep enough for every consumer to fill its largest batch
+    rows: asyncio.Queue = asyncio.Queue(maxsize=max_inflight * ctx.sizer.capacity)
+    results: asyncio.Queue = asyncio.Queue(maxsize=max_inflight)
+
+    cpu_tasks = [
+        asyncio.create_task(cpu_stage(rows, results, ctx))
+        for _ in range(max_inflight)
+    ]
+    log_tasks = [
+        asyncio.create_task(log_stage(results, ctx))
+        for _ in range(max_inflight)
+    ]
+
+    async def close_results() -> None:
+        await asyncio.gather(*cpu_tasks)
+        for _ in log_tasks:
+            await results.put(_END)
+
+    stages = [
+        asyncio.create_task(read_stage(path, rows, len(cpu_tasks), ctx)),
+        asyncio.create_task(close_results()),
+        *cpu_tasks,
+        *log_tasks,
+    ]
+
+    try:
+        # a failing stage must not leave its neighbours blocked on a full queue
+        done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    finally:
+        for task in stages:
+            task.cancel()
+
+
+# ============================
+# Parallel byte-range parsing
+# ============================
+
+async def process_csv_ranges(
+    path: Path,
+    ctx: RunContext,
+    max_inflight: int,
+    range_bytes: int = DEFAULT_RANGE_BYTES,
+) -> None:
+    """
+    Split the memory-mapped CSV into record-aligned byte ranges and let each
+    worker parse and analyse a whole range; the parent only emits results.
+    At most max_inflight ranges are outstanding at a time.
+    """
+    loop = asyncio.get_running_loop()
+    split_start = time.perf_counter()
+    header, ranges = split_record_ranges(path, range_bytes)
+    ctx.metrics.stage("split_ranges").record(time.perf_counter() - split_start, len(ranges))
+    # future -> (submit time, output ticket of the range)
+    pending: dict[asyncio.Future, tuple[float, int | None]] = {}
+
+    async def emit_completed(return_when: str) -> None:
+        done, _ = await asyncio.wait(pending, return_when=return_when)
+        for future in done:
+            submitted, ticket = pending.pop(future)
+            pairs, parse_seconds, analyze_seconds = future.result()
+            ctx.metrics.stage("cpu").record(time.perf_counter() - submitted, len(pairs))
+            ctx.metrics.stage("parse").record(parse_seconds, len(pairs))
+            ctx.metrics.stage("worker_compute").record(analyze_seconds, len(pairs))
+            if pairs:
+                ctx.metrics.record_worker(
+                    pairs[0][1]["pid"], len(pairs), parse_seconds + analyze_seconds
+                )
+            if ctx.writer is not None:
+                # rows are parsed in the workers, so a whole range holds one ticket
+                write_start = time.perf_counter()
+                await ctx.writer.write_block(ticket, pairs)
+                ctx.metrics.stage("emit").record(time.perf_counter() - write_start, len(pairs))
+                continue
+            await asyncio.gather(
+                *(emit_result(movie, result, ctx) for movie, result in pairs)
+            )
+
+    try:
+        for start, end in ranges:
+            if len(pending) >= max_inflight:
+                await emit_completed(asyncio.FIRST_COMPLETED)
+            future = loop.run_in_executor(
+                ctx.pool,
+                analyze_range,
+                str(path),
+                start,
+                end,
+                header,
+                ctx.engine,
+            )
+            ticket = ctx.writer.reserve() if ctx.writer is not None else None
+            pending[future] = (time.perf_counter(), ticket)
+        if pending:
+            await emit_completed(asyncio.ALL_COMPLETED)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# ============================
+# Executor selection
+# ============================
+
+def sample_overviews(path: Path, rows: int) -> tuple[list[str], int]:
+    """
+    Overviews of the first `rows` movies, plus the estimated number of rows
+    in the file (extrapolated from the bytes those rows took).
+    """
+    consumed = 0
+
+    def counted(lines):
+        nonlocal consumed
+        for line in lines:
+            consumed += len(line.encode("utf-8"))
+            yield line
+
+    with path.open(encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(counted(f))
+        overviews = [parse_movie_row(row).overview for row in islice(reader, rows)]
+
+    if len(overviews) < rows or not consumed:
+        # the sample is the whole file
+        return overviews, len(overviews)
+    return overviews, round(path.stat().st_size * len(overviews) / consumed)
+
+
+def select_executor(
+    path: Path,
+    kind: str,
+    workers: int,
+    engine: str,
+    profiler: RunProfiler | None = None,
+) -> tuple[str, Executor, dict]:
+    # with --profile, every pool worker profiles itself from startup
+    if kind != "auto":
+        hooks = profiler.hooks(kind) if profiler is not None else (None, ())
+        return kind, create_executor(kind, workers, *hooks), {}
+
+    overviews, total_rows = sample_overviews(path, DEFAULT_CALIBRATION_ROWS)
+    kind, pool, timings = calibrate(overviews, workers, engine, total_rows)
+    if profiler is not None and profiler.hooks(kind)[0] is not None:
+        # calibration pools are not profiled: run on a fresh, profiled pool
+        pool.shutdown()
+        pool = create_executor(kind, workers, *profiler.hooks(kind))
+    measured = ", ".join(f"{k} {t * 1e3:.2f} ms/row" for k, t in timings.items())
+    print(f"Executor auto: using {kind} ({measured or f'~{total_rows} rows, too few to calibrate'})")
+    return kind, pool, {"estimated_rows": total_rows, "seconds_per_row": timings}
 
 
 # ============================
 # CSV orchestration
 # ============================
 
-async def process_csv(path: Path, workers: int) -> None:
+async def process_csv(
+    path: Path,
+    workers: int,
+    engine: str = DEFAULT_ENGINE,
+    stream: bool = False,
+    max_inflight: int | None = None,
+    sizer: BatchSizer | None = None,
+    sink: ResultSink | None = None,
+    cache: ResultCache | None = None,
+    parallel_parse: bool = False,
+    report: Path | None = None,
+    shared_memory: bool = False,
+    writer: ResultWriter | None = None,
+    executor: str = DEFAULT_EXECUTOR,
+    daemon: DaemonClient | None = None,
+    profiler: RunProfiler | None = None,
+) -> None:
     # clamp requested workers to available CPU count
     cpu = os.cpu_count() or 1
     if workers > cpu:
         workers = cpu
+    max_inflight = max_inflight or workers * DEFAULT_INFLIGHT_PER_WORKER
+
+    if daemon is not None:
+        # connect before reading anything, so a missing daemon fails fast
+        await daemon.connect()
+        executor, pool, calibration = "daemon", None, {}
+    else:
+        executor, pool, calibration = select_executor(path, executor, workers, engine, profiler)
+    if profiler is not None:
+        # after --executor auto calibration, which is not part of the run's profile
+        profiler.start()
+    if shared_memory and executor != "process":
+        # the other backends already share the parent's memory
+        print(f"--shared-memory has no effect with the {executor} executor; ignoring it.")
+        shared_memory = False
 
-    pool = ProcessPoolExecutor(max_workers=workers)
+    ctx = RunContext(
+        pool=pool,
+        engine=engine,
+        sizer=sizer or BatchSizer(),
+        sink=sink,
+        cache=cache,
+        arenas=ArenaPool() if shared_memory else None,
+        writer=writer,
+        daemon=daemon,
+    )
 
     try:
+        if sink is not None:
+            sink.start()
+
+        if parallel_parse:
+            await process_csv_ranges(path, ctx, max_inflight)
+            return
+
+        if stream:
+            await stream_csv(path, ctx, max_inflight)
+            return
+
         tasks = []
 
         with path.open(encoding="utf-8", newline="") as f:
             reader = csv.DictReader(f)
+            movies = [parse_timed(row, ctx) for row in reader]
 
-            for row in reader:
-                movie = parse_movie_row(row)
-                tasks.append(
-                    process_movie_row(movie, pool)
-                )
+        if ctx.sizer.size == 1 and not ctx.sizer.auto:
+            tasks = [process_movie_row(movie, ctx) for movie in movies]
+        else:
+            start = 0
+            if ctx.sizer.auto:
+                # calibrate on a small probe batch before sizing the rest
+                probe = movies[:ctx.sizer.size]
+                probe_results = await analyze_movie_batch(probe, ctx)
+                tasks = [emit_result(m, r, ctx) for m, r in zip(probe, probe_results)]
+                start = len(probe)
+
+            size = ctx.sizer.size_for(len(movies) - start, workers)
+            for i in range(start, len(movies), size):
+                tasks.append(process_movie_batch(movies[i:i + size], ctx))
 
         await asyncio.gather(*tasks)
 
     finally:
-        pool.shutdown()
+        if pool is not None:
+            # waits for the workers to exit, which is when they dump profiles
+            pool.shutdown()
+        if profiler is not None:
+            profiler.stop()
+        if daemon is not None:
+            await daemon.close()
+        if ctx.arenas is not None:
+            ctx.arenas.close()
+        if sink is not None:
+            # flushes buffered results; raises if a batch was dropped
+            await sink.close()
+        if writer is not None:
+            # writes the buffered tail; raises if a row group failed
+            await writer.close()
+            print(writer.summary())
+        ctx.metrics.finish()
+        if cache is not None:
+            print(cache.summary())
+            cache.close()
+        if report is not None:
+            rows = ctx.metrics.stage("emit").items
+            ctx.metrics.write_report(
+                report,
+                csv_file=str(path),
+                mode="parallel-parse" if parallel_parse else "stream" if stream else "gather",
+                workers=workers,
+                executor=executor,
+                calibration=calibration or None,
+                engine=engine,
+                batch_size="auto" if ctx.sizer.auto else ctx.sizer.size,
+                final_batch_size=ctx.sizer.size,
+                max_inflight=max_inflight,
+                rows=rows,
+                rows_per_sec=rows / ctx.metrics.wall_seconds,
+                cache=None if cache is None else {
+                    "hits": cache.hits,
+                    "misses": cache.misses,
+                    "evictions": cache.evictions,
+                },
+            )
+        if profiler is not None:
+            written = profiler.write()
+            print(f"Profile written to {', '.join(map(str, written))}")
 
 
 # ============================
@@ -121,6 +552,149 @@ def main() -> None:
         default=cpu,
         help=f"Number of CPU workers (default: {cpu})",
     )
+    parser.add_argument(
+        "--executor",
+        choices=["auto", *available_executors()],
+        default=DEFAULT_EXECUTOR,
+        help=(
+            "Where analysis runs: process pool, thread pool (useful on free-threaded "
+            "builds), inline in the event loop, sub-interpreters (Python 3.14+), or "
+            f"'auto' to time the candidates on the first {DEFAULT_CALIBRATION_ROWS} rows "
+            f"(default: {DEFAULT_EXECUTOR})"
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help=f"Chunk analysis engine (default: {DEFAULT_ENGINE})",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream rows through a bounded reader -> CPU -> logging pipeline",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=None,
+        help=(
+            "Max outstanding pool jobs in --stream mode "
+            f"(default: workers x {DEFAULT_INFLIGHT_PER_WORKER})"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=parse_batch_size,
+        default=BatchSizer(),
+        help=(
+            "Overviews per pool submission: a number, or 'auto' to size "
+            "batches from the measured per-item cost (default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--sink-url",
+        default=None,
+        help="POST results in JSON batches to this http:// URL instead of printing them",
+    )
+    parser.add_argument(
+        "--sink-batch-size",
+        type=int,
+        default=DEFAULT_SINK_BATCH_SIZE,
+        help=f"Results per sink request (default: {DEFAULT_SINK_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--sink-flush-interval",
+        type=float,
+        default=DEFAULT_SINK_FLUSH_INTERVAL,
+        help=f"Seconds before a partial sink batch is sent (default: {DEFAULT_SINK_FLUSH_INTERVAL})",
+    )
+    parser.add_argument(
+        "--sink-concurrency",
+        type=int,
+        default=DEFAULT_SINK_CONCURRENCY,
+        help=f"Max in-flight sink requests / pooled connections (default: {DEFAULT_SINK_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--sink-timeout",
+        type=float,
+        default=DEFAULT_SINK_TIMEOUT,
+        help=f"Seconds a sink request may take before it is retried (default: {DEFAULT_SINK_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Reuse analysis results stored in this directory across runs",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_ENTRIES,
+        help=f"Max cached results before LRU eviction (default: {DEFAULT_CACHE_ENTRIES})",
+    )
+    parser.add_argument(
+        "--parallel-parse",
+        action="store_true",
+        help=(
+            "Memory-map the CSV and let each worker parse and analyse its own "
+            "record-aligned byte range"
+        ),
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Write a JSON run report (stage throughput/latency, queues, workers) here",
+    )
+    parser.add_argument(
+        "--shared-memory",
+        action="store_true",
+        help=(
+            "Pass batch overviews and results through shared memory instead of "
+            "pickling them (ignored with --parallel-parse)"
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write results (tmdb_id, counts, elapsed seconds) to this file instead of printing them",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="--output file format: buffered CSV or a binary columnar file (default: csv)",
+    )
+    parser.add_argument(
+        "--output-order",
+        choices=OUTPUT_ORDERS,
+        default="unordered",
+        help="Write results as they finish or in input order (default: unordered)",
+    )
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_SOCKET,
+        default=None,
+        metavar="SOCKET",
+        help=(
+            "Send batches to a running analysis_daemon.py on this Unix socket "
+            f"instead of starting a local pool (default socket: {DEFAULT_SOCKET})"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="PSTATS",
+        help=(
+            "Profile the parent and every worker process with cProfile and write the "
+            "merged stats here, plus a .txt report and .folded flamegraph stacks next to it"
+        ),
+    )
 
     args = parser.parse_args()
     # fallback with message when requested workers exceed available CPUs
@@ -129,7 +703,59 @@ def main() -> None:
             f"Requested workers {args.workers} > available CPUs {cpu}; falling back to {cpu}."
         )
         args.workers = cpu
-    asyncio.run(process_csv(args.csv_file, args.workers))
+    if args.max_inflight is not None and args.max_inflight < 1:
+        parser.error("--max-inflight must be >= 1")
+    if args.parallel_parse and (args.stream or args.cache_dir):
+        # workers parse rows themselves, so there is no parent-side row
+        # stream to feed the pipeline or to look up in the cache
+        parser.error("--parallel-parse cannot be combined with --stream or --cache-dir")
+    if args.daemon and (args.parallel_parse or args.shared_memory):
+        # the daemon receives overviews, not file ranges or local arenas
+        parser.error("--daemon cannot be combined with --parallel-parse or --shared-memory")
+    if args.profile and args.profile.suffix in (".txt", ".folded"):
+        # those suffixes name the report and the flamegraph input
+        parser.error("--profile path must not end in .txt or .folded (e.g. use run.pstats)")
+    if args.output and args.sink_url:
+        parser.error("--output cannot be combined with --sink-url")
+    sink = None
+    if args.sink_url:
+        try:
+            sink = ResultSink(
+                args.sink_url,
+                batch_size=args.sink_batch_size,
+                flush_interval=args.sink_flush_interval,
+                concurrency=args.sink_concurrency,
+                timeout=args.sink_timeout,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+    cache = ResultCache(args.cache_dir, args.cache_size) if args.cache_dir else None
+    writer = None
+    if args.output:
+        writer = ResultWriter(args.output, args.output_format, args.output_order)
+    daemon = DaemonClient(args.daemon) if args.daemon else None
+    try:
+        asyncio.run(
+            process_csv(
+                args.csv_file,
+                args.workers,
+                args.engine,
+                stream=args.stream,
+                max_inflight=args.max_inflight,
+                sizer=args.batch_size,
+                sink=sink,
+                cache=cache,
+                parallel_parse=args.parallel_parse,
+                report=args.report,
+                shared_memory=args.shared_memory,
+                writer=writer,
+                executor=args.executor,
+                daemon=daemon,
+                profiler=RunProfiler(args.profile) if args.profile else None,
+            )
+        )
+    except DaemonError as e:
+        parser.exit(1, f"{e}\n")
 
 
 if __name__ == "__main__":
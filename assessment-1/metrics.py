@@ -0,0 +1,173 @@
+import asyncio
+import json
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# latency histogram bucket upper bounds: 10µs doubling up to ~84s
+BUCKET_BOUNDS = tuple(1e-5 * 2 ** i for i in range(24))
+PERCENTILES = (50, 90, 99)
+
+
+# ============================
+# Latency histogram
+# ============================
+
+@dataclass
+class Histogram:
+    """
+    Fixed log-scale histogram; percentiles are reported as the upper bound
+    of the bucket they fall into, so they are accurate to within 2x.
+    """
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS) + 1))
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            **{f"p{q}": min(self.percentile(q), self.max) for q in PERCENTILES},
+            "buckets": {
+                f"le_{bound:.6f}": n
+                for bound, n in zip(BUCKET_BOUNDS + (float("inf"),), self.counts)
+                if n
+            },
+        }
+
+
+# ============================
+# Stage / queue / worker metrics
+# ============================
+
+@dataclass
+class StageMetrics:
+    """Items and time spent in one pipeline stage; one record per call."""
+    items: int = 0
+    busy_seconds: float = 0.0
+    latency: Histogram = field(default_factory=Histogram)
+
+    def record(self, seconds: float, items: int = 1) -> None:
+        self.items += items
+        self.busy_seconds += seconds
+        self.latency.record(seconds)
+
+    def to_dict(self, wall_seconds: float) -> dict:
+        return {
+            "items": self.items,
+            "calls": self.latency.count,
+            "busy_seconds": self.busy_seconds,
+            "items_per_sec": self.items / wall_seconds if wall_seconds else 0.0,
+            "latency_seconds": self.latency.to_dict(),
+        }
+
+
+@dataclass
+class QueueMetrics:
+    capacity: int
+    samples: int = 0
+    depth_total: int = 0
+    max_depth: int = 0
+
+    def sample(self, depth: int) -> None:
+        self.samples += 1
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "samples": self.samples,
+            "mean_depth": self.depth_total / self.samples if self.samples else 0.0,
+            "max_depth": self.max_depth,
+        }
+
+
+@dataclass
+class WorkerMetrics:
+    jobs: int = 0
+    items: int = 0
+    busy_seconds: float = 0.0
+
+
+class PipelineMetrics:
+    """
+    Collects per-stage throughput and latency, queue depths and per-worker
+    busy time (keyed by the worker `pid` in each result) for one run, and
+    renders them as a JSON-serialisable report.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.stages: dict[str, StageMetrics] = {}
+        self.queues: dict[str, QueueMetrics] = {}
+        self.workers: dict[int, WorkerMetrics] = {}
+
+    def stage(self, name: str) -> StageMetrics:
+        if name not in self.stages:
+            self.stages[name] = StageMetrics()
+        return self.stages[name]
+
+    def sample_queue(self, name: str, queue: asyncio.Queue) -> None:
+        if name not in self.queues:
+            self.queues[name] = QueueMetrics(capacity=queue.maxsize)
+        self.queues[name].sample(queue.qsize())
+
+    def record_worker(self, pid: int | None, items: int, seconds: float) -> None:
+        if pid is None:
+            return
+        worker = self.workers.setdefault(pid, WorkerMetrics())
+        worker.jobs += 1
+        worker.items += items
+        worker.busy_seconds += seconds
+
+    def finish(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def wall_seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self, **run_info) -> dict:
+        wall = self.wall_seconds
+        return {
+            "run": {**run_info, "wall_seconds": wall},
+            "stages": {name: stage.to_dict(wall) for name, stage in self.stages.items()},
+            "queues": {name: queue.to_dict() for name, queue in self.queues.items()},
+            "workers": {
+                str(pid): {
+                    "jobs": w.jobs,
+                    "items": w.items,
+                    "busy_seconds": w.busy_seconds,
+                    "utilization": w.busy_seconds / wall if wall else 0.0,
+                }
+                for pid, w in sorted(self.workers.items())
+            },
+        }
+
+    def write_report(self, path: Path, **run_info) -> None:
+        path.write_text(json.dumps(self.report(**run_info), indent=2), encoding="utf-8")
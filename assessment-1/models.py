@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class Movie:
+    movie_name: str
+    movie_link: str
+    fshare_link: str
+    original_title: str
+    genre: str
+    year: int
+    runtime: str
+    rating: float
+    overview: str
+    poster_url: str
+    backdrop_url: str
+    tmdb_id: str
+
+def parse_movie_row(row: dict[str, str]) -> Movie:
+    return Movie(
+        movie_name=row["Movie Name"].strip(),
+        movie_link=row["Movie Link"].strip(),
+        fshare_link=row["Fshare Link"].strip(),
+        original_title=row["Original Title"].strip(),
+        genre=row["Genre"].strip(),
+        year=int(row["Year"]),
+        runtime=row["Runtime"].strip(),
+        rating=float(row["Rating"].strip()) if row["Rating"].strip() else 0.0,
+        overview=row["Overview"].strip(),
+        poster_url=row["Poster URL"].strip(),
+        backdrop_url=row["Backdrop URL"].strip(),
+        tmdb_id=row["TMDB ID"].strip(),
+    )
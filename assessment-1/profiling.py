@@ -0,0 +1,165 @@
+import cProfile
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+from multiprocessing import util
+from pathlib import Path
+from typing import Callable
+
+REPORT_LINES = 30
+# deeper call paths are folded into their ancestor in the flamegraph output
+MAX_STACK_DEPTH = 64
+
+
+# ============================
+# Worker side
+# ============================
+
+def start_worker_profile(directory: str) -> None:
+    """
+    Process pool initializer: profile everything this worker process runs
+    (argument unpickling, analysis, result pickling) and dump the stats to
+    `directory` when the worker exits at pool shutdown.
+    """
+    profile = cProfile.Profile()
+    path = os.path.join(directory, f"worker-{os.getpid()}.pstats")
+    # multiprocessing runs finalizers on worker exit; atexit does not run there
+    util.Finalize(None, _dump_profile, args=(profile, path), exitpriority=100)
+    profile.enable()
+
+
+def _dump_profile(profile: cProfile.Profile, path: str) -> None:
+    profile.disable()
+    profile.dump_stats(path)
+
+
+# ============================
+# Flamegraph (folded stacks)
+# ============================
+
+def _label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # built-ins such as <method 'findall' of 're.Pattern' objects>
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+
+def folded_stacks(stats: pstats.Stats) -> list[str]:
+    """
+    Approximate "a;b;c <microseconds>" lines (flamegraph.pl, speedscope,
+    inferno) from cProfile's caller/callee graph. cProfile keeps one level
+    of callers only, so a function's time is split across its call paths in
+    proportion to the time each caller spent in it.
+    """
+    callees: dict[tuple, list[tuple[tuple, float]]] = {}
+    roots = []
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, edge_cumulative))
+
+    totals: dict[str, float] = {}
+
+    def walk(func: tuple, inclusive: float, path: tuple[str, ...], on_path: set) -> None:
+        _, _, self_time, cumulative, _ = stats.stats[func]
+        # paths under a microsecond would not show up; stop the walk there
+        if cumulative <= 0 or inclusive < 1e-6:
+            return
+        share = min(1.0, inclusive / cumulative)
+        path = path + (_label(func),)
+        if len(path) >= MAX_STACK_DEPTH:
+            totals[";".join(path)] = totals.get(";".join(path), 0.0) + inclusive
+            return
+        totals[";".join(path)] = totals.get(";".join(path), 0.0) + self_time * share
+        for callee, edge_cumulative in callees.get(func, ()):
+            # recursion: the callee's time is already inside this frame's
+            if callee not in on_path:
+                walk(callee, edge_cumulative * share, path, on_path | {callee})
+
+    for root in roots:
+        walk(root, stats.stats[root][3], (), {root})
+
+    return [
+        f"{stack} {round(seconds * 1e6)}"
+        for stack, seconds in sorted(totals.items())
+        if round(seconds * 1e6) > 0
+    ]
+
+
+# ============================
+# Run profiler
+# ============================
+
+class RunProfiler:
+    """
+    Profiles the parent (event loop thread) with cProfile and, through the
+    pool initializer from `hooks`, every worker process or thread. `write`
+    merges them into one pstats file, a text report and folded stacks.
+    """
+
+    def __init__(self, output: Path) -> None:
+        self.output = output
+        self.worker_dir = tempfile.mkdtemp(prefix="movie-profile-")
+        self._profile = cProfile.Profile()
+        self._thread_profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def hooks(self, kind: str) -> tuple[Callable | None, tuple]:
+        """(initializer, initargs) that profile the workers of a `kind` executor."""
+        if kind == "process":
+            return start_worker_profile, (self.worker_dir,)
+        if kind == "thread" and sys.version_info < (3, 12):
+            return self._start_thread_profile, ()
+        # 3.12+ threads: cProfile sees every thread, so the parent's profile
+        # covers them (and a second profile could not be enabled);
+        # inline runs in the parent; sub-interpreters are not profiled
+        return None, ()
+
+    def _start_thread_profile(self) -> None:
+        # before 3.12 a profile only sees the thread that enabled it
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_profiles.append(profile)
+        profile.enable()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def write(self) -> list[Path]:
+        """
+        Merge the parent and worker profiles (call after the pool has shut
+        down, so the workers have dumped theirs) and return the files written.
+        """
+        worker_files = sorted(Path(self.worker_dir).glob("worker-*.pstats"))
+        stats = pstats.Stats(self._profile)
+        for path in worker_files:
+            stats.add(str(path))
+        # the pool's threads have exited; their profiles are complete
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        shutil.rmtree(self.worker_dir, ignore_errors=True)
+
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(self.output)
+
+        report_path = self.output.with_suffix(".txt")
+        with report_path.open("w", encoding="utf-8") as f:
+            f.write(
+                f"Merged profile: parent + {len(worker_files)} worker process(es)"
+                f" + {len(self._thread_profiles)} worker thread(s)\n"
+            )
+            stats.stream = f
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LINES)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_LINES)
+
+        folded_path = self.output.with_suffix(".folded")
+        folded_path.write_text("\n".join(folded_stacks(stats)) + "\n", encoding="utf-8")
+        return [self.output, report_path, folded_path]
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from analize_content import ANALYZER_VERSION
+
+CACHE_FILENAME = "analysis-cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 1_000_000
+CACHED_KEYS = ("chunk_count", "total_words", "total_rare_score")
+# stay below SQLite's bound-parameter limit
+_QUERY_CHUNK = 500
+
+# entry_count mirrors COUNT(*) of results (a full scan, ~30 ms at 1M
+# rows), kept exact by triggers so every process sharing the file sees
+# the same size
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        chunk_count INTEGER NOT NULL,
+        total_words INTEGER NOT NULL,
+        total_rare_score INTEGER NOT NULL,
+        last_used REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)",
+    "CREATE TABLE IF NOT EXISTS entry_count (n INTEGER NOT NULL)",
+    """
+    CREATE TRIGGER IF NOT EXISTS results_inserted AFTER INSERT ON results
+    BEGIN UPDATE entry_count SET n = n + 1; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS results_deleted AFTER DELETE ON results
+    BEGIN UPDATE entry_count SET n = n - 1; END
+    """,
+)
+
+
+class ResultCache:
+    """
+    Persistent analysis results keyed by sha256(analyzer version + overview),
+    stored in an SQLite file under `directory`.
+
+    Every hit refreshes the entry's last-used time; once the cache holds
+    more than `max_entries` rows the least recently used ones are evicted.
+    Results from a different ANALYZER_VERSION never match, so changing the
+    scoring invalidates old entries without clearing the file.
+
+    `get_many`/`put_many` run the SQLite calls on a dedicated I/O thread,
+    so lookups and inserts never block the event loop. Several processes
+    may share one file: the entry count is read from the database in the
+    same transaction that inserts, so eviction sees their rows too.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        version: str = ANALYZER_VERSION,
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / CACHE_FILENAME
+        self.max_entries = max_entries
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # created here, then only used by the single I/O thread
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction():
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+            # seeds the count for a file created before entry_count existed
+            self._db.execute(
+                "INSERT INTO entry_count SELECT COUNT(*) FROM results "
+                "WHERE NOT EXISTS (SELECT 1 FROM entry_count)"
+            )
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache")
+
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front: the count read inside
+        # cannot change under another process before the eviction
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def key(self, overview: str) -> str:
+        return hashlib.sha256(f"{self.version}\0{overview}".encode("utf-8")).hexdigest()
+
+    async def get_many(self, overviews: list[str]) -> list[dict | None]:
+        """Cached result per overview, or None where it has not been analysed."""
+        return await asyncio.get_running_loop().run_in_executor(self._io, self._get_many, overviews)
+
+    async def put_many(self, overviews: list[str], results: list[dict]) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._io, self._put_many, overviews, results)
+
+    def _get_many(self, overviews: list[str]) -> list[dict | None]:
+        keys = [self.key(overview) for overview in overviews]
+        found: dict[str, dict] = {}
+
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            rows = self._db.execute(
+                f"SELECT key, {', '.join(CACHED_KEYS)} FROM results "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, *values in rows:
+                found[key] = dict(zip(CACHED_KEYS, values))
+
+        if found:
+            now = time.time()
+            with self._transaction():
+                self._db.executemany(
+                    "UPDATE results SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+
+        results = [found.get(key) for key in keys]
+        hits = len(keys) - results.count(None)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return results
+
+    def _put_many(self, overviews: list[str], results: list[dict]) -> None:
+        now = time.time()
+        with self._transaction():
+            self._db.executemany(
+                f"INSERT OR IGNORE INTO results (key, {', '.join(CACHED_KEYS)}, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (self.key(overview), *(result[k] for k in CACHED_KEYS), now)
+                    for overview, result in zip(overviews, results)
+                ],
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        excess = self._entries() - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def _entries(self) -> int:
+        (count,) = self._db.execute("SELECT n FROM entry_count").fetchone()
+        return count
+
+    def __len__(self) -> int:
+        return self._io.submit(self._entries).result()
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"Cache {self.path}: hits={self.hits} misses={self.misses} "
+            f"hit_rate={rate:.1%} evictions={self.evictions} entries={len(self)}"
+        )
+
+    def close(self) -> None:
+        self._io.shutdown()
+        self._db.close()
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.1
+# seconds one request (send + full response) may take before it is retried
+DEFAULT_TIMEOUT = 30.0
+
+# statuses worth retrying: the server may accept the same batch later
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SinkError(Exception):
+    pass
+
+
+# ============================
+# Keep-alive HTTP connection pool
+# ============================
+
+@dataclass
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class HttpConnectionPool:
+    """
+    Minimal HTTP/1.1 client for POSTing JSON over at most `size`
+    persistent connections. Idle connections are reused; a request waits
+    when all connections are busy. A request that takes longer than
+    `timeout` seconds raises TimeoutError and its connection is dropped.
+    """
+
+    def __init__(self, host: str, port: int, size: int, timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle: list[_Connection] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def _acquire(self) -> _Connection:
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, conn: _Connection, reusable: bool) -> None:
+        if reusable:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def post_json(self, path: str, body: bytes) -> int:
+        """Send one POST and return the response status code."""
+        conn = await self._acquire()
+        reusable = False
+        try:
+            status, reusable = await asyncio.wait_for(self._exchange(conn, path, body), self.timeout)
+            return status
+        finally:
+            self._release(conn, reusable)
+
+    async def _exchange(self, conn: _Connection, path: str, body: bytes) -> tuple[int, bool]:
+        """Write the request, read the whole response: (status, connection reusable)."""
+        conn.writer.write(
+            (
+                f"POST {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: keep-alive\r\n"
+                "\r\n"
+            ).encode("ascii")
+            + body
+        )
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+
+        headers: dict[str, str] = {}
+        while (line := await conn.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        reusable = headers.get("connection", "").lower() != "close"
+        if status in (204, 304):
+            pass  # never a body, whatever the headers say
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            await self._read_chunked(conn.reader)
+        elif "content-length" in headers:
+            await conn.reader.readexactly(int(headers["content-length"]))
+        else:
+            # no length: the body ends when the server closes the connection
+            await conn.reader.read()
+            reusable = False
+        return status, reusable
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> None:
+        """Consume a chunked body, trailers included."""
+        while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        while await reader.readuntil(b"\r\n") != b"\r\n":
+            pass
+
+    async def close(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+# ============================
+# Batching result sink
+# ============================
+
+class ResultSink:
+    """
+    Accumulates result records and POSTs them as JSON batches
+    (`{"results": [...]}`) to `url`.
+
+    A batch is flushed when it reaches `batch_size` records or when
+    `flush_interval` seconds pass without a flush. At most `concurrency`
+    batches are in flight; `submit` waits when that limit is reached, which
+    back-pressures the producer. Failed batches are retried with
+    exponential backoff; a batch that still fails makes `close` raise, as
+    does any submitted record that was not delivered.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Unsupported sink URL (expected http://host[:port]/path): {url}")
+
+        self.path = parts.path or "/"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._pool = HttpConnectionPool(parts.hostname, parts.port or 80, concurrency, timeout)
+        self._in_flight = asyncio.Semaphore(concurrency)
+        self._buffer: list[dict] = []
+        self._sends: set[asyncio.Task] = set()
+        self._last_flush = time.monotonic()
+        self._timer: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+        self._error: Exception | None = None
+
+        self.submitted_records = 0
+        self.sent_records = 0
+        self.sent_batches = 0
+        self.retries = 0
+
+    async def __aenter__(self) -> "ResultSink":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Start the time-based flush timer (needs a running event loop)."""
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_periodically())
+
+    async def submit(self, record: dict) -> None:
+        if self._error is not None:
+            raise self._error
+        self._buffer.append(record)
+        self.submitted_records += 1
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Send up to `batch_size` buffered records as one batch."""
+        if not self._buffer:
+            return
+        # records leave the buffer only once a send slot is held, so nothing
+        # is lost if this wait is cancelled
+        await self._in_flight.acquire()
+        if not self._buffer:
+            # another flush took them while this one waited
+            self._in_flight.release()
+            return
+        batch = self._buffer[:self.batch_size]
+        del self._buffer[:self.batch_size]
+        self._last_flush = time.monotonic()
+
+        task = asyncio.create_task(self._send(batch))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _flush_periodically(self) -> None:
+        # `close` sets _stopping and waits for this loop, so a flush is
+        # never interrupted halfway
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                if time.monotonic() - self._last_flush >= self.flush_interval:
+                    await self.flush()
+
+    async def _send(self, batch: list[dict]) -> None:
+        body = json.dumps({"results": batch}, ensure_ascii=False).encode("utf-8")
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.retries += 1
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                try:
+                    status = await self._pool.post_json(self.path, body)
+                except (
+                    OSError,
+                    asyncio.TimeoutError,
+                    asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError,
+                    ValueError,
+                    IndexError,
+                ) as e:
+                    reason = f"{type(e).__name__}: {e}"
+                    continue
+
+                if 200 <= status < 300:
+                    self.sent_records += len(batch)
+                    self.sent_batches += 1
+                    return
+                reason = f"HTTP {status}"
+                if status not in RETRY_STATUSES:
+                    break
+
+            self._error = SinkError(f"Dropped batch of {len(batch)} results after {reason}")
+            print(self._error, file=sys.stderr)
+        finally:
+            self._in_flight.release()
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._stopping.set()
+            await self._timer
+            self._timer = None
+        while self._buffer:
+            await self.flush()
+        if self._sends:
+            await asyncio.gather(*self._sends)
+        await self._pool.close()
+        if self._error is not None:
+            raise self._error
+        if self.sent_records != self.submitted_records:
+            raise SinkError(
+                f"Delivered {self.sent_records} of {self.submitted_records} submitted results"
+            )
@@ -0,0 +1,289 @@
+import argparse
+import asyncio
+import csv
+import io
+import struct
+import sys
+import time
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from models import Movie
+
+DEFAULT_ROW_GROUP = 4096
+DEFAULT_MAX_PENDING = 4
+FORMATS = ("csv", "columnar")
+ORDERS = ("unordered", "ordered")
+
+# (name, array typecode); "s" is a UTF-8 string column
+COLUMNS = (
+    ("tmdb_id", "s"),
+    ("chunk_count", "q"),
+    ("total_words", "q"),
+    ("total_rare_score", "q"),
+    ("elapsed_seconds", "d"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+# columnar file: MAGIC, then row groups of
+#   <I rows> and, per column, <I byte length><zlib-compressed payload>
+# int/float payloads are little-endian arrays; a string payload is
+# rows+1 int64 offsets followed by the UTF-8 blob. The length prefix lets a
+# reader skip the columns it does not need.
+MAGIC = b"RCOL\x01"
+_U32 = struct.Struct("<I")
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+# ============================
+# Encoders
+# ============================
+
+def encode_csv_header() -> bytes:
+    return (",".join(COLUMN_NAMES) + "\r\n").encode("utf-8")
+
+
+def encode_csv_group(records: list[tuple]) -> bytes:
+    out = io.StringIO()
+    csv.writer(out).writerows(records)
+    return out.getvalue().encode("utf-8")
+
+
+def encode_columnar_group(records: list[tuple]) -> bytes:
+    parts = [_U32.pack(len(records))]
+    for i, (_, typecode) in enumerate(COLUMNS):
+        values = [record[i] for record in records]
+        if typecode == "s":
+            blobs = [value.encode("utf-8") for value in values]
+            offsets = array("q", [0])
+            for blob in blobs:
+                offsets.append(offsets[-1] + len(blob))
+            payload = _little_endian(offsets) + b"".join(blobs)
+        else:
+            payload = _little_endian(array(typecode, values))
+        # level 1: most of the size win (small ints in int64 slots) for little CPU
+        payload = zlib.compress(payload, 1)
+        parts += [_U32.pack(len(payload)), payload]
+    return b"".join(parts)
+
+
+def read_columnar(path: Path, columns: tuple[str, ...] = COLUMN_NAMES) -> dict[str, list]:
+    """Load the requested columns of a columnar result file."""
+    unknown = set(columns) - set(COLUMN_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+    data: dict[str, list] = {name: [] for name in columns}
+    with path.open("rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a columnar result file")
+        while header := f.read(_U32.size):
+            (rows,) = _U32.unpack(header)
+            for name, typecode in COLUMNS:
+                (length,) = _U32.unpack(f.read(_U32.size))
+                if name not in data:
+                    f.seek(length, io.SEEK_CUR)
+                    continue
+                payload = zlib.decompress(f.read(length))
+                if typecode == "s":
+                    split = (rows + 1) * 8
+                    offsets = _from_little_endian("q", payload[:split])
+                    blob = payload[split:]
+                    data[name].extend(
+                        blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(rows)
+                    )
+                else:
+                    data[name].extend(_from_little_endian(typecode, payload))
+    return data
+
+
+# ============================
+# Writer
+# ============================
+
+class ResultWriter:
+    """
+    Buffers analysis results and appends them to `path` in row groups of
+    `row_group` records, as CSV or as the columnar format above.
+
+    Encoding and file writes run on one background thread, so the event
+    loop only appends to a list; `write` waits only when `max_pending`
+    row groups are already queued for the thread.
+
+    In "ordered" mode rows come out in input order: every row (or block
+    of rows) takes a ticket with `reserve` when it is read, and results
+    that finish early wait in memory until all earlier tickets are written.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fmt: str = "csv",
+        order: str = "unordered",
+        row_group: int = DEFAULT_ROW_GROUP,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown output format: {fmt}")
+        if order not in ORDERS:
+            raise ValueError(f"Unknown output order: {order}")
+
+        self.path = path
+        self.format = fmt
+        self.ordered = order == "ordered"
+        self.row_group = row_group
+        self._encode = encode_columnar_group if fmt == "columnar" else encode_csv_group
+
+        self._file = path.open("wb")
+        self._file.write(MAGIC if fmt == "columnar" else encode_csv_header())
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-writer")
+        self._slots = asyncio.Semaphore(max_pending)
+        self._writes: set[asyncio.Future] = set()
+        self._buffer: list[tuple] = []
+        self._error: Exception | None = None
+        self._start = time.perf_counter()
+
+        # ordered mode: movie id -> ticket, finished tickets waiting on earlier ones
+        self._tickets: dict[int, int] = {}
+        self._finished: dict[int, list[tuple]] = {}
+        self._next_ticket = 0
+        self._next_out = 0
+
+        self.written_rows = 0
+        self.written_groups = 0
+
+    def reserve(self, movie: Movie | None = None) -> int:
+        """
+        Take the next output position. A ticket for `movie` is redeemed by
+        `write(movie, ...)`; a ticket taken without one is for `write_block`.
+        """
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        if self.ordered and movie is not None:
+            # the movie object stays alive until it is written, so its id is stable
+            self._tickets[id(movie)] = ticket
+        return ticket
+
+    def _record(self, movie: Movie, result: dict) -> tuple:
+        return (
+            movie.tmdb_id,
+            result["chunk_count"],
+            result["total_words"],
+            result["total_rare_score"],
+            round(time.perf_counter() - self._start, 6),
+        )
+
+    async def write(self, movie: Movie, result: dict) -> None:
+        record = self._record(movie, result)
+        if self.ordered:
+            await self._finish(self._tickets.pop(id(movie)), [record])
+        else:
+            await self._append([record])
+
+    async def write_block(self, ticket: int, pairs: list[tuple[Movie, dict]]) -> None:
+        records = [self._record(movie, result) for movie, result in pairs]
+        if self.ordered:
+            await self._finish(ticket, records)
+        else:
+            await self._append(records)
+
+    async def _finish(self, ticket: int, records: list[tuple]) -> None:
+        self._finished[ticket] = records
+        while self._next_out in self._finished:
+            # advance before waiting: if the wait is cancelled, the records
+            # are already in the buffer and later tickets still come out
+            ready = self._finished.pop(self._next_out)
+            self._next_out += 1
+            await self._append(ready)
+
+    async def _append(self, records: list[tuple]) -> None:
+        if self._error is not None:
+            raise self._error
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.row_group:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        # rows leave the buffer only once a write slot is held, so nothing
+        # is lost if this wait is cancelled
+        await self._slots.acquire()
+        if not self._buffer:
+            # another flush took them while this one waited
+            self._slots.release()
+            return
+        group, self._buffer = self._buffer, []
+
+        future = asyncio.get_running_loop().run_in_executor(self._io, self._write_group, group)
+        self._writes.add(future)
+        future.add_done_callback(self._write_done)
+
+    def _write_group(self, group: list[tuple]) -> None:
+        # single I/O thread, so groups land in submission order
+        self._file.write(self._encode(group))
+        self.written_rows += len(group)
+        self.written_groups += 1
+
+    def _write_done(self, future: asyncio.Future) -> None:
+        self._writes.discard(future)
+        self._slots.release()
+        if not future.cancelled() and future.exception() is not None:
+            self._error = future.exception()
+
+    async def close(self) -> None:
+        """Write everything buffered and close the file; raises a failed write."""
+        try:
+            await self.flush()
+            if self._writes:
+                await asyncio.gather(*self._writes, return_exceptions=True)
+        finally:
+            self._io.shutdown()
+            self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def summary(self) -> str:
+        return f"Wrote {self.written_rows} results to {self.path} ({self.format}, {self.written_groups} row groups)"
+
+
+# ============================
+# CLI: dump a columnar file as CSV
+# ============================
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print a columnar result file as CSV")
+    parser.add_argument("path", type=Path, help="Columnar file written by main.py --output")
+    parser.add_argument(
+        "--columns",
+        nargs="+",
+        choices=COLUMN_NAMES,
+        default=list(COLUMN_NAMES),
+        help="Columns to read; the others are skipped on disk (default: all)",
+    )
+    args = parser.parse_args()
+
+    data = read_columnar(args.path, tuple(args.columns))
+    writer = csv.writer(sys.stdout)
+    writer.writerow(args.columns)
+    writer.writerows(zip(*(data[name] for name in args.columns)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import os
+import sys
+import time
+from collections import OrderedDict
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from analize_content import DEFAULT_ENGINE, analize_content
+
+# arena layout for a batch of n overviews, all little-endian int64 ("q"):
+#   [n x (offset, length)]  input table, offsets relative to the blob
+#   [n x RESULT_FIELDS]     fixed-width results written by the worker
+#   [blob]                  UTF-8 overviews, back to back
+RESULT_FIELDS = ("chunk_count", "total_words", "total_rare_score", "pid")
+_WORD = 8
+_INPUT_WIDTH = 2
+_RESULT_WIDTH = len(RESULT_FIELDS)
+# attachments a worker keeps open for arenas the parent reuses
+_MAX_ATTACHED = 16
+
+
+def _layout(count: int) -> tuple[int, int]:
+    """Byte offsets of the result table and the blob for `count` items."""
+    results_at = count * _INPUT_WIDTH * _WORD
+    blob_at = results_at + count * _RESULT_WIDTH * _WORD
+    return results_at, blob_at
+
+
+# ============================
+# Worker side
+# ============================
+
+_attached: "OrderedDict[str, SharedMemory]" = OrderedDict()
+
+
+def _attach(name: str) -> SharedMemory:
+    shm = _attached.get(name)
+    if shm is not None:
+        _attached.move_to_end(name)
+        return shm
+
+    if sys.version_info >= (3, 13):
+        shm = SharedMemory(name=name, track=False)
+    else:
+        # attaching registers the segment with the resource tracker the
+        # worker shares with the parent, which then reports it as leaked or
+        # unregisters it twice; the parent owns the segment, so skip that
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            shm = SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+    _attached[name] = shm
+    if len(_attached) > _MAX_ATTACHED:
+        _attached.popitem(last=False)[1].close()
+    return shm
+
+
+def analyze_shared(name: str, count: int, engine: str = DEFAULT_ENGINE) -> float:
+    """
+    Analyse the `count` overviews stored in arena `name` and write their
+    results into its result table. Returns the seconds spent analysing;
+    nothing else crosses the process boundary.
+    """
+    start = time.perf_counter()
+    shm = _attach(name)
+    results_at, blob_at = _layout(count)
+    table = shm.buf[:results_at].cast("q")
+    results = shm.buf[results_at:blob_at].cast("q")
+    pid = os.getpid()
+
+    try:
+        for i in range(count):
+            offset, length = table[2 * i], table[2 * i + 1]
+            overview = str(shm.buf[blob_at + offset:blob_at + offset + length], "utf-8")
+            result = analize_content(overview, engine)
+            base = i * _RESULT_WIDTH
+            results[base] = result["chunk_count"]
+            results[base + 1] = result["total_words"]
+            results[base + 2] = result["total_rare_score"]
+            results[base + 3] = pid
+    finally:
+        table.release()
+        results.release()
+
+    return time.perf_counter() - start
+
+
+# ============================
+# Parent side
+# ============================
+
+class SharedArena:
+    """One shared-memory segment holding a batch's inputs and results."""
+
+    def __init__(self, size: int) -> None:
+        self.shm = SharedMemory(create=True, size=size)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def size(self) -> int:
+        return self.shm.size
+
+    def write_inputs(self, encoded: list[bytes]) -> None:
+        results_at, blob_at = _layout(len(encoded))
+        table = self.shm.buf[:results_at].cast("q")
+        offset = 0
+        try:
+            for i, data in enumerate(encoded):
+                table[2 * i] = offset
+                table[2 * i + 1] = len(data)
+                start = blob_at + offset
+                self.shm.buf[start:start + len(data)] = data
+                offset += len(data)
+        finally:
+            table.release()
+
+    def read_results(self, count: int) -> list[dict]:
+        results_at, blob_at = _layout(count)
+        values = self.shm.buf[results_at:blob_at].cast("q")
+        try:
+            flat = values.tolist()
+        finally:
+            values.release()
+        return [
+            dict(zip(RESULT_FIELDS, flat[i:i + _RESULT_WIDTH]))
+            for i in range(0, len(flat), _RESULT_WIDTH)
+        ]
+
+    def destroy(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ArenaPool:
+    """
+    Reuses shared-memory arenas across batches so steady-state runs do not
+    create and unlink a segment per submission. An arena too small for a
+    batch is replaced by a larger one.
+    """
+
+    def __init__(self) -> None:
+        self._free: list[SharedArena] = []
+        self.created = 0
+
+    def acquire(self, overviews: list[str]) -> tuple[SharedArena, int]:
+        encoded = [overview.encode("utf-8") for overview in overviews]
+        _, blob_at = _layout(len(encoded))
+        needed = max(1, blob_at + sum(map(len, encoded)))
+
+        arena = self._free.pop() if self._free else None
+        if arena is None or arena.size < needed:
+            if arena is not None:
+                arena.destroy()
+            # headroom so slightly larger batches still fit
+            arena = SharedArena(needed + needed // 2)
+            self.created += 1
+
+        arena.write_inputs(encoded)
+        return arena, len(encoded)
+
+    def release(self, arena: SharedArena) -> None:
+        self._free.append(arena)
+
+    def close(self) -> None:
+        for arena in self._free:
+            arena.destroy()
+        self._free.clear()
@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import json
+import time
+
+from result_sink import ResultSink
+
+DEFAULT_LATENCY = 0.1  # same delay the original mock logger simulated
+DEFAULT_BATCH_SIZES = (1, 10, 100, 1000)
+
+
+# ============================
+# Stub HTTP endpoint
+# ============================
+
+class StubSinkServer:
+    """
+    Local stand-in for the result API: accepts keep-alive HTTP/1.1 POSTs of
+    `{"results": [...]}`, waits `latency` seconds per request and answers
+    200. Every `fail_every`-th request gets a 503 instead, to exercise the
+    sink's retry path.
+    """
+
+    def __init__(self, latency: float = DEFAULT_LATENCY, fail_every: int = 0) -> None:
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self.connections = 0
+        self.received = 0
+        self._server: asyncio.base_events.Server | None = None
+        self._handlers: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/results"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def stop(self) -> None:
+        self._server.close()
+        # close lingering keep-alive connections so their handlers finish
+        for writer in self._handlers.values():
+            writer.close()
+        await asyncio.gather(*self._handlers)
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "StubSinkServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            while await reader.readline():  # request line; b"" on disconnect
+                length = 0
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = await reader.readexactly(length)
+
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                if self.fail_every and self.requests % self.fail_every == 0:
+                    status, payload = "503 Service Unavailable", b"{}"
+                else:
+                    accepted = len(json.loads(body)["results"])
+                    self.received += accepted
+                    status, payload = "200 OK", json.dumps({"accepted": accepted}).encode()
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode("ascii")
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            self._handlers.pop(asyncio.current_task(), None)
+
+
+# ============================
+# Throughput vs. batch size
+# ============================
+
+async def measure_throughput(
+    records: int,
+    batch_size: int,
+    concurrency: int,
+    latency: float,
+) -> dict:
+    async with StubSinkServer(latency=latency) as server:
+        start = time.perf_counter()
+        async with ResultSink(server.url, batch_size=batch_size, concurrency=concurrency) as sink:
+            for i in range(records):
+                await sink.submit({"tmdb_id": str(i), "total_words": i})
+        elapsed = time.perf_counter() - start
+
+    return {
+        "batch_size": batch_size,
+        "records": server.received,
+        "requests": server.requests,
+        "connections": server.connections,
+        "seconds": elapsed,
+        "records_per_sec": server.received / elapsed,
+    }
+
+
+async def sweep(args: argparse.Namespace) -> None:
+    print(f"{'batch':>6} {'records':>8} {'requests':>8} {'conns':>6} {'seconds':>8} {'records/s':>10}")
+    for batch_size in args.batch_sizes:
+        r = await measure_throughput(args.records, batch_size, args.concurrency, args.latency)
+        print(
+            f"{r['batch_size']:>6} {r['records']:>8} {r['requests']:>8} "
+            f"{r['connections']:>6} {r['seconds']:>8.3f} {r['records_per_sec']:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure ResultSink throughput against a local stub endpoint"
+    )
+    parser.add_argument("--records", type=int, default=2000, help="Records per run (default: 2000)")
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_BATCH_SIZES),
+        help=f"Batch sizes to compare (default: {' '.join(map(str, DEFAULT_BATCH_SIZES))})",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="In-flight batches (default: 4)")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=DEFAULT_LATENCY,
+        help=f"Simulated server latency per request in seconds (default: {DEFAULT_LATENCY})",
+    )
+    asyncio.run(sweep(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
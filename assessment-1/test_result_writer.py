@@ -0,0 +1,61 @@
+import asyncio
+import csv
+import threading
+
+import pytest
+
+from models import Movie
+from result_writer import ResultWriter
+
+RESULT = {"chunk_count": 1, "total_words": 2, "total_rare_score": 3}
+
+
+def movie(tmdb_id: str) -> Movie:
+    return Movie(*([""] * 11), tmdb_id=tmdb_id)
+
+
+def written_ids(path) -> list[str]:
+    with path.open(encoding="utf-8", newline="") as f:
+        return [row["tmdb_id"] for row in csv.DictReader(f)]
+
+
+@pytest.mark.parametrize("order", ["unordered", "ordered"])
+def test_cancelled_flush_keeps_its_rows(tmp_path, order):
+    # one write slot, held by a group the I/O thread cannot finish yet
+    path = tmp_path / "out.csv"
+    unblock = threading.Event()
+
+    async def run() -> None:
+        writer = ResultWriter(path, order=order, row_group=2, max_pending=1)
+        write_group = writer._write_group
+
+        def slow_write_group(group):
+            unblock.wait()
+            write_group(group)
+
+        writer._write_group = slow_write_group
+        movies = [movie(str(i)) for i in range(6)]
+        for m in movies:
+            writer.reserve(m)
+        for m in movies[:2]:
+            await writer.write(m, RESULT)
+
+        # fills the next group, then blocks in flush waiting for the slot
+        await writer.write(movies[2], RESULT)
+        blocked = asyncio.create_task(writer.write(movies[3], RESULT))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        blocked.cancel()
+        try:
+            await blocked
+        except asyncio.CancelledError:
+            pass
+
+        unblock.set()
+        for m in movies[4:]:
+            await writer.write(m, RESULT)
+        await writer.close()
+        assert writer.written_rows == 6
+
+    asyncio.run(run())
+    assert written_ids(path) == [str(i) for i in range(6)]
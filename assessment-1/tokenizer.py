@@ -0,0 +1,42 @@
+import re
+from typing import Iterator
+
+# one alternation walks the text once: group 1 is a word, otherwise the
+# match is the whitespace after a sentence end (the SENTENCE_SPLIT pattern)
+TOKEN_PATTERN = re.compile(r"(\w+)|(?<=[.!?])\s+")
+
+
+def iter_chunk_stats(
+    text: str,
+    max_sentences: int,
+    rare_len_over: int,
+) -> Iterator[tuple[int, int]]:
+    """
+    Yield (word_count, rare_word_count) for each chunk of max_sentences
+    sentences, in a single scan and without building sentence, chunk or
+    word strings.
+
+    Gives the same chunks and counts as splitting with SENTENCE_SPLIT,
+    joining groups with " " and running WORD_PATTERN over each join: the
+    split points are whitespace, so re-joining never changes word tokens.
+    """
+    # equivalent of text.strip() without copying the text; trailing
+    # whitespace after a final "." would otherwise count as a boundary
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+
+    words = rare = sentences = 0
+    for match in TOKEN_PATTERN.finditer(text, 0, end):
+        if match.lastindex:
+            words += 1
+            if match.end() - match.start() > rare_len_over:
+                rare += 1
+        else:
+            sentences += 1
+            if sentences == max_sentences:
+                yield words, rare
+                words = rare = sentences = 0
+
+    # the last (possibly only, possibly empty) chunk
+    yield words, rare
@@ -0,0 +1,105 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# most recently used `/movies` pages kept; 0 disables the cache
+QUERY_CACHE_ENTRIES = int(os.environ.get("MOVIE_QUERY_CACHE_ENTRIES", "1024"))
+# upper bound on the cached bodies' total size
+QUERY_CACHE_BYTES = int(os.environ.get("MOVIE_QUERY_CACHE_BYTES", str(64 * 1024 * 1024)))
+# replaced generations remembered to refuse late puts; a late put comes
+# from a request already running at the reload, so recent ones suffice
+RETIRED_GENERATIONS = 1024
+
+# (JSON body, position of the next page) as returned by TenantStore.page_json
+Page = Tuple[bytes, Optional[int]]
+
+
+class QueryCache:
+    """LRU cache of `/movies` pages, keyed by the query and the store's generation.
+
+    Stores are immutable and every build gets a new generation, so an entry
+    can never be stale: a reloaded tenant simply stops hitting the old
+    generation's entries. `invalidate` drops them right away to free their
+    memory instead of waiting for them to age out, and remembers the
+    generation: a request that read the old store before the reload may
+    `put` its page afterwards, and that page would otherwise sit in the
+    cache unused until evicted. Only the last `max_retired` generations
+    are remembered; a put for an older one is cached and ages out like
+    any other unused entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_ENTRIES,
+        max_bytes: int = QUERY_CACHE_BYTES,
+        max_retired: int = RETIRED_GENERATIONS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_retired = max_retired
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[tuple, Page]" = OrderedDict()
+        self._bytes = 0
+        # insertion-ordered set: the oldest retired generation is first
+        self._retired: "OrderedDict[int, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Page]:
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key: tuple, page: Page) -> None:
+        size = len(page[0])
+        # a body this large would push out most other entries
+        if self.max_entries <= 0 or size > self.max_bytes // 16:
+            return
+        with self._lock:
+            if key[0] in self._retired:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._entries[key] = page
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[0])
+                self.evictions += 1
+
+    def invalidate(self, generation: int) -> None:
+        """Drop the entries of one store generation (keys start with it) and
+        refuse any later `put` for it."""
+        with self._lock:
+            self._retired[generation] = None
+            self._retired.move_to_end(generation)
+            while len(self._retired) > self.max_retired:
+                self._retired.popitem(last=False)
+            stale = [key for key in self._entries if key[0] == generation]
+            for key in stale:
+                self._bytes -= len(self._entries.pop(key)[0])
+            self.invalidations += len(stale)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,162 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Union, overload
+
+from app.models import Movie
+
+# free-text fields: one UTF-8 blob per column plus an offsets array
+TEXT_FIELDS = (
+    "movie_name",
+    "movie_link",
+    "fshare_link",
+    "original_title",
+    "overview",
+    "poster_url",
+    "backdrop_url",
+    "tmdb_id",
+)
+# few distinct values: stored once, referenced by a small integer code
+INTERNED_FIELDS = ("genre", "runtime")
+# stands in for year=None in the int32 year column
+NO_YEAR = -(2**31)
+
+
+class _TextColumn:
+    """Strings packed back to back as UTF-8; item i is blob[offsets[i]:offsets[i + 1]]."""
+
+    def __init__(self):
+        self.offsets = array("q", [0])
+        self._buffer = bytearray()
+        self.blob = b""
+
+    def append(self, value: str) -> None:
+        self._buffer += value.encode("utf-8")
+        self.offsets.append(len(self._buffer))
+
+    def freeze(self) -> None:
+        self.blob = bytes(self._buffer)
+        self._buffer = bytearray()
+
+    def __getitem__(self, i: int) -> str:
+        # the blob may also be a memoryview (see CompactMovies.from_buffers)
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+class _InternedColumn:
+    """Distinct values kept once; each row stores a uint32 code."""
+
+    def __init__(self):
+        self.values: List[object] = []
+        self.codes = array("I")
+        self._lookup: Dict[object, int] = {}
+
+    def append(self, value: object) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def freeze(self) -> None:
+        self._lookup = {}
+
+    def __getitem__(self, i: int) -> object:
+        return self.values[self.codes[i]]
+
+
+class CompactMovies(Sequence[Movie]):
+    """Read-only, column-oriented list of movies.
+
+    Holds no `Movie` objects: indexing builds one on demand from the column
+    arrays, so it can replace `List[Movie]` wherever movies are only read.
+    Free text is stored as UTF-8 (smaller than Python's 2-byte-per-char
+    strings for Vietnamese text), `genre`/`runtime` are interned, and
+    `year`/`rating` live in typed arrays.
+    """
+
+    def __init__(self, movies: Iterable[Movie]):
+        self._text = {name: _TextColumn() for name in TEXT_FIELDS}
+        self._interned = {name: _InternedColumn() for name in INTERNED_FIELDS}
+        self._year = array("i")
+        self._rating = array("d")
+
+        for movie in movies:
+            for name, column in self._text.items():
+                column.append(getattr(movie, name))
+            for name, column in self._interned.items():
+                column.append(getattr(movie, name))
+            self._year.append(NO_YEAR if movie.year is None else movie.year)
+            self._rating.append(movie.rating)
+
+        for column in (*self._text.values(), *self._interned.values()):
+            column.freeze()
+
+    def buffers(self) -> Dict[str, Any]:
+        """Every column as a flat array or bytes object, keyed by name."""
+        buffers: Dict[str, Any] = {}
+        for name, column in self._text.items():
+            buffers[f"{name}.offsets"] = column.offsets
+            buffers[f"{name}.blob"] = column.blob
+        for name, column in self._interned.items():
+            buffers[f"{name}.codes"] = column.codes
+        buffers["year"] = self._year
+        buffers["rating"] = self._rating
+        return buffers
+
+    def interned_values(self) -> Dict[str, List[object]]:
+        return {name: column.values for name, column in self._interned.items()}
+
+    @classmethod
+    def from_buffers(cls, buffers: Dict[str, Any], interned_values: Dict[str, List[object]]) -> "CompactMovies":
+        """Rebuild from `buffers()` output, e.g. memoryviews over a mapped file.
+
+        The buffers are used as they are, not copied.
+        """
+        movies = cls(())
+        for name, column in movies._text.items():
+            column.offsets = buffers[f"{name}.offsets"]
+            column.blob = buffers[f"{name}.blob"]
+        for name, column in movies._interned.items():
+            column.values = interned_values[name]
+            column.codes = buffers[f"{name}.codes"]
+        movies._year = buffers["year"]
+        movies._rating = buffers["rating"]
+        return movies
+
+    def __len__(self) -> int:
+        return len(self._year)
+
+    def _movie(self, i: int) -> Movie:
+        year = self._year[i]
+        return Movie(
+            movie_name=self._text["movie_name"][i],
+            movie_link=self._text["movie_link"][i],
+            fshare_link=self._text["fshare_link"][i],
+            original_title=self._text["original_title"][i],
+            genre=self._interned["genre"][i],
+            year=None if year == NO_YEAR else year,
+            runtime=self._interned["runtime"][i],
+            rating=self._rating[i],
+            overview=self._text["overview"][i],
+            poster_url=self._text["poster_url"][i],
+            backdrop_url=self._text["backdrop_url"][i],
+            tmdb_id=self._text["tmdb_id"][i],
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Movie: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Movie]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Movie, List[Movie]]:
+        if isinstance(index, slice):
+            return [self._movie(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("movie index out of range")
+        return self._movie(index)
+
+    def __iter__(self) -> Iterator[Movie]:
+        for i in range(len(self)):
+            yield self._movie(i)
@@ -1,9 +1,16 @@
+import codecs
 import csv
+import io
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, Iterator, List
 
 from app.models import Movie
 
+# an uploaded CSV without these columns is rejected
+REQUIRED_COLUMNS = {"Movie Name", "TMDB ID"}
+# bytes of an upload read and decoded at a time
+UPLOAD_CHUNK = 64 * 1024
+
 
 def parse_movie_row(row: dict[str, str]) -> Movie:
     # tolerant parsing for optional numeric fields
@@ -35,10 +42,74 @@ def parse_movie_row(row: dict[str, str]) -> Movie:
     )
 
 
-def load_movies_from_csv(path: Path) -> List[Movie]:
-    movies: List[Movie] = []
+def iter_movies_from_csv(path: Path) -> Iterator[Movie]:
     with path.open(encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            movies.append(parse_movie_row(row))
-    return movies
+            yield parse_movie_row(row)
+
+
+def load_movies_from_csv(path: Path) -> List[Movie]:
+    return list(iter_movies_from_csv(path))
+
+
+def iter_upload_lines(f: BinaryIO, chunk_size: int = UPLOAD_CHUNK) -> Iterator[str]:
+    """Decode a binary UTF-8 file into lines, as a text file opened with
+    `newline=""` would (line endings kept, `\r\n`, `\r` and `\n` all end a
+    line), reading `chunk_size` bytes at a time.
+
+    `io.TextIOWrapper` does this too, but needs `readable()` and friends,
+    which the SpooledTemporaryFile behind an upload lacks before Python 3.11.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    # pieces of a line that has not ended yet (e.g. a long quoted Overview),
+    # joined once when it ends so a long line is never copied per chunk
+    pending: List[str] = []
+    while True:
+        chunk = f.read(chunk_size)
+        for line in io.StringIO(decoder.decode(chunk, final=not chunk), newline="").readlines():
+            if pending and pending[-1].endswith("\r"):
+                # a "\r" that ended the previous chunk: "\r\n" when this starts with "\n"
+                if line.startswith("\n"):
+                    pending.append("\n")
+                    line = line[1:]
+                yield "".join(pending)
+                pending = []
+                if not line:
+                    continue
+            if not pending and line.endswith("\n"):
+                yield line
+            else:
+                pending.append(line)
+                if line.endswith("\n"):
+                    yield "".join(pending)
+                    pending = []
+        if not chunk:
+            if pending:
+                yield "".join(pending)
+            return
+
+
+def iter_movies_from_upload(f: BinaryIO) -> Iterator[Movie]:
+    """Parse an uploaded CSV row by row straight from its binary file.
+
+    Only one decoded chunk is held at a time, never the whole upload.
+    Raises ValueError for a missing header or columns, a malformed CSV or
+    a row that fails to parse, and UnicodeDecodeError for non UTF-8 input.
+    """
+    try:
+        reader = csv.DictReader(iter_upload_lines(f))
+        # basic validation: ensure headers present
+        if not reader.fieldnames:
+            raise ValueError("No CSV header found")
+        headers = set(reader.fieldnames)
+        if not REQUIRED_COLUMNS.issubset(headers):
+            raise ValueError(f"Missing required columns: {REQUIRED_COLUMNS - headers}")
+
+        for row in reader:
+            try:
+                yield parse_movie_row(row)
+            except Exception as e:
+                raise ValueError(f"Failed to parse row: {e}")
+    except csv.Error as e:
+        raise ValueError(f"Malformed CSV: {e}")
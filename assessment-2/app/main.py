@@ -1,14 +1,19 @@
-from fastapi import FastAPI, HTTPException, Query, Request, Header, Depends, UploadFile, File
+from fastapi import FastAPI, HTTPException, Query, Request, Header, Depends, UploadFile, File, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pathlib import Path
-from typing import List, Optional, Dict
-import csv
-import io
+from typing import BinaryIO, List, Optional, Dict
 import time
 import logging
 import os
 
-from app.models import Movie
-from app.data_loader import load_movies_from_csv, parse_movie_row
+from app.cache import Page, QueryCache
+from app.data_loader import iter_movies_from_upload
+from app.pagination import NDJSON_MEDIA_TYPE, decode_cursor, encode_cursor
+from app.shared import SHARED_STORE_DIR, SharedTenants
+from app.snapshot import open_tenant, source_fingerprint
+from app.store import TenantStore, build_tenant, normalize_genre
+from app.tenants import WATCH_INTERVAL, CsvWatcher, TenantRegistry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("assessment-2")
@@ -27,30 +32,65 @@ async def timing_middleware(request: Request, call_next):
     logger.info(f"{request.method} {request.url.path} -> {response.status_code} in {elapsed:.6f}s")
     return response
 
-# multi-tenant in-memory store: tenant -> list[Movie]
-MOVIES_STORE: Dict[str, List[Movie]] = {}
+# multi-tenant in-memory store: tenant -> indexed movies (copy-on-write)
+MOVIES_STORE = TenantRegistry()
 DEFAULT_TENANT = "movies"
+# background reloads of changed CSVs, when MOVIE_CSV_WATCH_INTERVAL is set
+CSV_WATCHER: Optional[CsvWatcher] = None
+# tenants mapped from a directory shared by all workers, when MOVIE_SHARED_STORE_DIR is set
+SHARED_TENANTS: Optional[SharedTenants] = None
+# filtered /movies pages; a replaced store's entries are dropped
+QUERY_CACHE = QueryCache()
+MOVIES_STORE.on_replaced(lambda store: QUERY_CACHE.invalidate(store.generation))
 
 
 @app.on_event("startup")
 def startup_load():
-    global MOVIES_STORE
+    global CSV_WATCHER, SHARED_TENANTS
     # default CSV path relative to this folder
     base = Path(__file__).parent / "csv"
-    # load known tenants if present
-    MOVIES_STORE.clear()
-    # default tenant
-    default_path = base / "movies.csv"
-    if default_path.exists():
-        MOVIES_STORE["movies"] = load_movies_from_csv(default_path)
-    # optional tv_serials tenant
-    tv_serials_path = base / "tv_serials.csv"
-    if tv_serials_path.exists():
-        MOVIES_STORE["tv_serials"] = load_movies_from_csv(tv_serials_path)
+    if SHARED_STORE_DIR:
+        SHARED_TENANTS = SharedTenants(Path(SHARED_STORE_DIR))
+    # load known tenants if present: the default tenant and optional tv_serials
+    tenants: Dict[str, TenantStore] = {}
+    fingerprints = {}
+    for tenant in ("movies", "tv_serials"):
+        csv_path = base / f"{tenant}.csv"
+        if csv_path.exists():
+            fingerprints[tenant] = source_fingerprint(csv_path)
+            if SHARED_TENANTS is not None:
+                # the first worker here loads it, the others wait and map its copy
+                SHARED_TENANTS.load_csv(tenant, csv_path)
+            else:
+                tenants[tenant] = open_tenant(csv_path)
+    if SHARED_TENANTS is not None:
+        SHARED_TENANTS.sync(MOVIES_STORE)
+    else:
+        MOVIES_STORE.replace(tenants)
 
+    if WATCH_INTERVAL > 0:
+        CSV_WATCHER = CsvWatcher(MOVIES_STORE, base, WATCH_INTERVAL, SHARED_TENANTS)
+        for tenant, fingerprint in fingerprints.items():
+            CSV_WATCHER.mark_loaded(tenant, fingerprint)
+        CSV_WATCHER.start()
 
-def get_tenant_store(tenant: Optional[str] = None, x_tenant: Optional[str] = Header(None)) -> List[Movie]:
-    """Dependency that returns the movie list for the requested tenant.
+
+@app.on_event("shutdown")
+def stop_watcher():
+    global CSV_WATCHER
+    if CSV_WATCHER is not None:
+        CSV_WATCHER.stop()
+        CSV_WATCHER = None
+
+
+def sync_tenants() -> None:
+    """Pick up tenants changed through other workers (shared store only)."""
+    if SHARED_TENANTS is not None:
+        SHARED_TENANTS.sync(MOVIES_STORE)
+
+
+def get_tenant_store(tenant: Optional[str] = None, x_tenant: Optional[str] = Header(None)) -> TenantStore:
+    """Dependency that returns the indexed movie store for the requested tenant.
 
     Priority: `x-tenant` header -> `tenant` query param -> default tenant
     """
@@ -62,36 +102,108 @@ def get_tenant_store(tenant: Optional[str] = None, x_tenant: Optional[str] = Hea
         )
 
     sel = x_tenant or tenant
+    sync_tenants()
     store = MOVIES_STORE.get(sel)
     if store is None:
         raise HTTPException(status_code=404, detail=f"Tenant not found: {sel}")
     return store
 
 
+def cursor_start(cursor: Optional[str], tenant_store: TenantStore) -> int:
+    """Position a `cursor` points at; 0 when no cursor was sent."""
+    if cursor is None:
+        return 0
+    try:
+        generation, start = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # positions only mean something within the store the cursor came from
+    if generation != tenant_store.generation:
+        raise HTTPException(status_code=410, detail="Cursor expired: tenant was reloaded")
+    return start
+
+
+def movies_page(
+    tenant_store: TenantStore,
+    genre: Optional[str],
+    year: Optional[int],
+    limit: Optional[int],
+    start: int,
+    search: Optional[str],
+) -> Page:
+    """`TenantStore.page_json` through the query cache."""
+    if not genre and not year and not search:
+        # a single slice of the pre-serialized movies: as cheap as a cache hit
+        return tenant_store.page_json(limit=limit, start=start)
+    key = (tenant_store.generation, normalize_genre(genre) if genre else None, year, search, limit, start)
+    page = QUERY_CACHE.get(key)
+    if page is None:
+        page = tenant_store.page_json(genre=genre, year=year, limit=limit, start=start, search=search)
+        QUERY_CACHE.put(key, page)
+    return page
+
+
 @app.get("/movies", response_model=List[dict])
 def get_movies(
+    request: Request,
     limit: Optional[int] = Query(None, ge=1),
     genre: Optional[str] = None,
     year: Optional[int] = None,
-    tenant_store: List[Movie] = Depends(get_tenant_store),
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    tenant_store: TenantStore = Depends(get_tenant_store),
 ):
-    results = tenant_store
-    if genre:
-        results = [m for m in results if genre.lower() in (m.genre or "").lower()]
-    if year:
-        results = [m for m in results if m.year == year]
-    if limit:
-        results = results[:limit]
-    # convert dataclass to dict for JSON
-    return [m.__dict__ for m in results]
+    start = cursor_start(cursor, tenant_store)
+
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        # one movie per line, produced chunk by chunk from the store captured here
+        chunks, next_start = tenant_store.page_ndjson(genre=genre, year=year, limit=limit, start=start, search=search)
+        response = StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE)
+    else:
+        # index lookups: cost follows the result size, not the tenant size;
+        # movies were serialized at load time, so the body is joined bytes
+        body, next_start = movies_page(tenant_store, genre, year, limit, start, search)
+        response = Response(content=body, media_type="application/json")
+    if next_start is not None:
+        next_cursor = encode_cursor(tenant_store.generation, next_start)
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
 
 
 @app.get("/movies/{tmdb_id}")
-def get_movie(tmdb_id: str, tenant_store: List[Movie] = Depends(get_tenant_store)):
-    for m in tenant_store:
-        if m.tmdb_id == tmdb_id:
-            return m.__dict__
-    raise HTTPException(status_code=404, detail="Movie not found")
+def get_movie(tmdb_id: str, tenant_store: TenantStore = Depends(get_tenant_store)):
+    body = tenant_store.get_json(tmdb_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return Response(content=body, media_type="application/json")
+
+
+def build_upload_tenant(f: BinaryIO) -> TenantStore:
+    """Parse and index an uploaded CSV (blocking; run in a worker thread)."""
+    f.seek(0)
+    return build_tenant(iter_movies_from_upload(f))
+
+
+def publish_tenant(tenant: str, store: TenantStore) -> None:
+    if SHARED_TENANTS is None:
+        MOVIES_STORE.publish(tenant, store)
+        return
+    # writes the shared snapshot; every worker then maps it, this one included
+    SHARED_TENANTS.publish(tenant, store)
+    SHARED_TENANTS.sync(MOVIES_STORE)
+
+
+def reload_tenant_csv(tenant: str, csv_path: Path) -> TenantStore:
+    if SHARED_TENANTS is None:
+        store = open_tenant(csv_path)
+        MOVIES_STORE.publish(tenant, store)
+        return store
+    SHARED_TENANTS.load_csv(tenant, csv_path)
+    SHARED_TENANTS.sync(MOVIES_STORE)
+    return MOVIES_STORE[tenant]
 
 
 @app.post("/reload")
@@ -100,57 +212,52 @@ async def reload_csv(
     file: Optional[UploadFile] = File(None),
 ):
     # allow reloading into a specific tenant, but only whitelist accepted tenants
+    sync_tenants()
     if tenant not in MOVIES_STORE:
         raise HTTPException(status_code=400, detail=f"Unsupported tenant: {tenant}")
 
-    # If an uploaded file is provided, parse it in-memory and validate CSV
+    # Parsing and indexing run in a worker thread so other requests keep being
+    # served; the new store is published only once it is complete, so a
+    # failed reload leaves the tenant untouched.
     if file is not None:
-        content = await file.read()
         try:
-            text = content.decode("utf-8")
-        except Exception:
+            # the upload is already spooled to a temporary file; parse it from there
+            store = await run_in_threadpool(build_upload_tenant, file.file)
+        except UnicodeDecodeError:
             raise HTTPException(status_code=400, detail="Uploaded file must be UTF-8 encoded CSV")
-
-        try:
-            stream = io.StringIO(text)
-            reader = csv.DictReader(stream)
-            # basic validation: ensure headers present
-            required = {"Movie Name", "TMDB ID"}
-            if not reader.fieldnames:
-                raise ValueError("No CSV header found")
-            headers = set(reader.fieldnames)
-            if not required.issubset(headers):
-                raise ValueError(f"Missing required columns: {required - headers}")
-
-            movies = []
-            for row in reader:
-                try:
-                    movies.append(parse_movie_row(row))
-                except Exception as e:
-                    raise ValueError(f"Failed to parse row: {e}")
-
         except ValueError as ve:
             raise HTTPException(status_code=400, detail=f"Invalid CSV: {ve}")
 
-        MOVIES_STORE[tenant] = movies
-        return {"loaded": len(MOVIES_STORE[tenant]), "tenant": tenant}
+        logger.info(f"{tenant}: loaded upload ({len(store)} movies, search index {store.search_index.build_seconds:.3f}s)")
+        await run_in_threadpool(publish_tenant, tenant, store)
+        return {"loaded": len(store), "tenant": tenant}
 
     # no upload — load from default tenant csv file
     csv_path = Path(__file__).parent / "csv" / f"{tenant}.csv"
     if not csv_path.exists():
         raise HTTPException(status_code=404, detail=f"CSV not found: {csv_path}")
-    MOVIES_STORE[tenant] = load_movies_from_csv(csv_path)
-    return {"loaded": len(MOVIES_STORE[tenant]), "tenant": tenant}
+    store = await run_in_threadpool(reload_tenant_csv, tenant, csv_path)
+    return {"loaded": len(store), "tenant": tenant}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return QUERY_CACHE.stats()
 
 
 @app.get("/tenants", response_model=List[str])
 def list_tenants():
+    sync_tenants()
     return list(MOVIES_STORE.keys())
 
 
 @app.post("/tenants")
 def add_tenant(tenant: str):
-    if tenant in MOVIES_STORE:
+    if SHARED_TENANTS is None:
+        added = MOVIES_STORE.add(tenant, build_tenant([]))
+    else:
+        added = SHARED_TENANTS.add(tenant, build_tenant([]))
+        SHARED_TENANTS.sync(MOVIES_STORE)
+    if not added:
         raise HTTPException(status_code=400, detail=f"Tenant already exists: {tenant}")
-    MOVIES_STORE[tenant] = []
     return {"message": f"Tenant added: {tenant}"}
\ No newline at end of file
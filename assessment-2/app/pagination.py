@@ -0,0 +1,24 @@
+import base64
+import binascii
+from typing import Tuple
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def encode_cursor(generation: int, position: int) -> str:
+    """Opaque cursor: where the next page starts in one build of a tenant."""
+    raw = f"{generation}:{position}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Return (generation, position); raises ValueError for a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        generation, position = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        generation_num, position_num = int(generation), int(position)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if generation_num < 1 or position_num < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return generation_num, position_num
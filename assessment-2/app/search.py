@@ -0,0 +1,259 @@
+import math
+import re
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from heapq import heappush, heappushpop, nsmallest
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.models import Movie
+
+# fields searched by `search`, with the weight of one occurrence of a word
+SEARCH_FIELDS = {"movie_name": 3, "original_title": 3, "overview": 1}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# with at most this many candidates (movies with the query's rarest word, or
+# in the filters' shortest position list) all are scored; with more, the top
+# results are found with the threshold walk
+EXHAUSTIVE_LIMIT = 4096
+
+_WORD = re.compile(r"\w+")
+# NFD splits Vietnamese letters into base + combining marks (tones, circumflex,
+# breve, horn), which are dropped; đ has no decomposition and is mapped by hand
+_FOLD = {codepoint: None for codepoint in range(0x300, 0x370)}
+_FOLD.update({ord("đ"): "d", ord("Đ"): "d"})
+
+
+def fold(text: str) -> str:
+    """Case- and accent-insensitive form of `text`: "Phim Hài" -> "phim hai"."""
+    return unicodedata.normalize("NFD", text).translate(_FOLD).casefold()
+
+
+# folding is the costly part of tokenizing, and words repeat a lot
+_fold_word = lru_cache(maxsize=1 << 16)(fold)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(unicodedata.normalize("NFC", text))
+
+
+def tokenize(text: str) -> List[str]:
+    return [_fold_word(word) for word in _words(text)]
+
+
+class SearchIndex:
+    """Inverted index over SEARCH_FIELDS, ranked with BM25.
+
+    Postings are stored flat: term id `t` owns `docs[starts[t]:starts[t + 1]]`
+    (ascending movie positions) and the aligned `impacts`, the BM25
+    term-frequency part of each posting, computed once at build time. A
+    query's score is then sum(idf * impact). `by_impact` lists each term's
+    postings again, best impact first, so the top matches are read first.
+
+    A query matches the movies containing every one of its words. Built
+    like `JsonFragments`: `add` each movie in position order, then `freeze`.
+    """
+
+    def __init__(self):
+        self.terms: Mapping[str, int] = {}
+        self.starts: Sequence[int] = array("q", [0])
+        self.docs: Sequence[int] = array("i")
+        self.impacts: Sequence[float] = array("f")
+        self.by_impact: Sequence[int] = array("i")
+        self.n_docs = 0
+        # time spent indexing, for load logs
+        self.build_seconds = 0.0
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._lengths = array("I")
+
+    def add(self, movie: Movie) -> None:
+        start = time.perf_counter()
+        doc = len(self._lengths)
+        counts: Dict[str, int] = {}
+        for field, weight in SEARCH_FIELDS.items():
+            for word, count in Counter(_words(getattr(movie, field) or "")).items():
+                term = _fold_word(word)
+                counts[term] = counts.get(term, 0) + count * weight
+        for term, count in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("i"), array("I"))
+            postings[0].append(doc)
+            postings[1].append(count)
+        self._lengths.append(sum(counts.values()))
+        self.build_seconds += time.perf_counter() - start
+
+    def freeze(self) -> None:
+        """Compute impacts and lay out the postings; no `add` after this."""
+        start = time.perf_counter()
+        lengths = self._lengths
+        average = sum(lengths) / len(lengths) if lengths else 1.0
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / average) for length in lengths]
+
+        terms: Dict[str, int] = {}
+        # sorted term ids let a snapshot look terms up by binary search
+        for term in sorted(self._postings):
+            docs, counts = self._postings.pop(term)
+            impacts = [count * (BM25_K1 + 1) / (count + norms[doc]) for doc, count in zip(docs, counts)]
+            terms[term] = len(self.starts) - 1
+            self.docs.extend(docs)
+            self.impacts.extend(impacts)
+            # stable: equal impacts stay in position order
+            self.by_impact.extend(sorted(range(len(impacts)), key=impacts.__getitem__, reverse=True))
+            self.starts.append(len(self.docs))
+
+        self.terms = terms
+        self.n_docs = len(lengths)
+        self._lengths = array("I")
+        self.build_seconds += time.perf_counter() - start
+
+    @classmethod
+    def from_buffers(
+        cls,
+        terms: Mapping[str, int],
+        starts: Sequence[int],
+        docs: Sequence[int],
+        impacts: Sequence[float],
+        by_impact: Sequence[int],
+        n_docs: int,
+    ) -> "SearchIndex":
+        """A frozen index over existing buffers (e.g. a mapped file), not copied."""
+        index = cls()
+        index.terms = terms
+        index.starts = starts
+        index.docs = docs
+        index.impacts = impacts
+        index.by_impact = by_impact
+        index.n_docs = n_docs
+        return index
+
+    def idf(self, term_id: int) -> float:
+        df = self.starts[term_id + 1] - self.starts[term_id]
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def _score(self, doc: int, postings: List[Tuple[int, int, float]]) -> Optional[float]:
+        """BM25 score of `doc` over (start, stop, idf) postings ranges, or
+        None if it lacks one of the terms.
+        """
+        docs, score = self.docs, 0.0
+        for start, stop, weight in postings:
+            i = bisect_left(docs, doc, start, stop)
+            if i == stop or docs[i] != doc:
+                return None
+            score += weight * self.impacts[i]
+        return score
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        matches: Optional[Callable[[int], bool]] = None,
+        candidates: Optional[Sequence[int]] = None,
+    ) -> List[int]:
+        """Positions of the movies containing every word of `query` (and
+        accepted by `matches`), best first; equal scores keep CSV order.
+
+        `candidates`, if given, are ascending positions that include every
+        movie `matches` accepts (e.g. one year's movies); when it is shorter
+        than the rarest word's postings, it is scanned instead.
+        """
+        term_ids = []
+        for term in dict.fromkeys(tokenize(query)):
+            term_id = self.terms.get(term)
+            if term_id is None:
+                return []
+            term_ids.append(term_id)
+        if not term_ids:
+            return []
+
+        # rarest first: the shortest postings bound the candidates
+        term_ids.sort(key=lambda term_id: self.starts[term_id + 1] - self.starts[term_id])
+        postings = [(self.starts[term_id], self.starts[term_id + 1], self.idf(term_id)) for term_id in term_ids]
+        rarest = postings[0][1] - postings[0][0]
+        if candidates is not None and len(candidates) < rarest:
+            # a selective filter: most of the walk would meet filtered-out movies
+            if limit is None or len(candidates) <= max(EXHAUSTIVE_LIMIT, rarest // 8):
+                return self._search_all(postings, limit, matches, candidates)
+        elif limit is None or rarest <= EXHAUSTIVE_LIMIT:
+            return self._search_all(postings, limit, matches)
+        return self._search_top(postings, limit, matches)
+
+    def _search_all(
+        self,
+        postings: List[Tuple[int, int, float]],
+        limit: Optional[int],
+        matches: Optional[Callable[[int], bool]],
+        candidates: Optional[Sequence[int]] = None,
+    ) -> List[int]:
+        """Score every movie holding the rarest term, or every candidate."""
+        ranked = []
+        if candidates is not None:
+            for doc in candidates:
+                if matches is None or matches(doc):
+                    score = self._score(doc, postings)
+                    if score is not None:
+                        ranked.append((-score, doc))
+        else:
+            (first, last, first_weight), rest = postings[0], postings[1:]
+            docs, impacts = self.docs, self.impacts
+            for i in range(first, last):
+                doc = docs[i]
+                if matches is not None and not matches(doc):
+                    continue
+                # the rarest term's impact is at hand; same sums as _score
+                score = 0.0 + first_weight * impacts[i]
+                for start, stop, weight in rest:
+                    j = bisect_left(docs, doc, start, stop)
+                    if j == stop or docs[j] != doc:
+                        break
+                    score += weight * impacts[j]
+                else:
+                    ranked.append((-score, doc))
+        ranked = sorted(ranked) if limit is None else nsmallest(limit, ranked)
+        return [doc for _, doc in ranked]
+
+    def _search_top(
+        self,
+        postings: List[Tuple[int, int, float]],
+        limit: int,
+        matches: Optional[Callable[[int], bool]],
+    ) -> List[int]:
+        """Top `limit` by the threshold algorithm.
+
+        Walks every term's postings best impact first, scoring each movie
+        met. A movie not met yet scores at most the sum of the impacts at
+        the current depth, so the walk stops once the `limit`-th best score
+        beats that bound, usually long before the postings end.
+        """
+        docs, impacts, by_impact = self.docs, self.impacts, self.by_impact
+        best: List[Tuple[float, int]] = []  # min-heap of (score, -position)
+        seen = set()
+        depth = 0
+        while True:
+            bound = 0.0
+            for start, stop, weight in postings:
+                if start + depth == stop:
+                    # every movie with all the terms is in this list: all seen
+                    return [-neg for _, neg in sorted(best, reverse=True)]
+                bound += weight * impacts[start + by_impact[start + depth]]
+            if len(best) == limit and best[0][0] > bound:
+                return [-neg for _, neg in sorted(best, reverse=True)]
+
+            for start, _, _ in postings:
+                doc = docs[start + by_impact[start + depth]]
+                if doc in seen:
+                    continue
+                seen.add(doc)
+                if matches is not None and not matches(doc):
+                    continue
+                score = self._score(doc, postings)
+                if score is None:
+                    continue
+                if len(best) < limit:
+                    heappush(best, (score, -doc))
+                elif (score, -doc) > best[0]:
+                    heappushpop(best, (score, -doc))
+            depth += 1
@@ -0,0 +1,162 @@
+import fcntl
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
+
+from app.snapshot import SNAPSHOT_SUFFIX, open_snapshot, source_fingerprint, write_snapshot
+from app.store import TenantStore, load_tenant
+
+if TYPE_CHECKING:
+    from app.tenants import TenantRegistry
+
+# directory shared by every worker process, best on tmpfs (e.g. /dev/shm/movies);
+# empty (default): each process loads and holds its own tenants
+SHARED_STORE_DIR = os.environ.get("MOVIE_SHARED_STORE_DIR", "")
+
+MANIFEST = "tenants.json"
+# writers flock this file; its first 8 bytes count the published changes
+VERSION_FILE = "tenants.version"
+_VERSION = struct.Struct("<Q")
+
+
+class SharedTenants:
+    """Tenants kept in a directory of snapshots that all workers map.
+
+    Each published tenant version is a snapshot file (app.snapshot) named
+    after its generation. It is written once, by whichever process loads
+    it, and every worker maps it read-only, so the OS holds one copy
+    however many workers there are. `tenants.json` lists each tenant's
+    current generation, and a counter in `tenants.version` is bumped after
+    every change. `sync` compares that counter (a read from a mapping, no
+    system call) and maps the new generations when it moved, so a reload
+    through one worker is seen by the next request on any worker.
+
+    Generations come from the manifest, so they and the cursors built on
+    them mean the same in every worker. Writers hold an exclusive flock on
+    `tenants.version`; readers take no lock.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._writing() as fd:
+            if os.fstat(fd).st_size < _VERSION.size:
+                os.ftruncate(fd, _VERSION.size)
+        with (directory / VERSION_FILE).open("rb") as f:
+            self._version = mmap.mmap(f.fileno(), _VERSION.size, access=mmap.ACCESS_READ)
+        # version the registry was last synced to, and the stores it holds
+        self._synced: Optional[int] = None
+        self._stores: Dict[int, TenantStore] = {}
+        self._sync_lock = threading.Lock()
+
+    @contextmanager
+    def _writing(self) -> Iterator[int]:
+        # a new open file per writer: flock also excludes threads of one process
+        fd = os.open(self.directory / VERSION_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        finally:
+            os.close(fd)
+
+    def _snapshot_path(self, generation: int) -> Path:
+        return self.directory / f"{generation}{SNAPSHOT_SUFFIX}"
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.directory / MANIFEST).read_bytes())
+        except FileNotFoundError:
+            return {"next_generation": 1, "tenants": {}}
+
+    def _publish(
+        self,
+        fd: int,
+        manifest: Dict[str, Any],
+        tenant: str,
+        store: TenantStore,
+        source: Optional[Dict[str, int]],
+    ) -> None:
+        """Write `store` as the tenant's next generation; the writer lock is held."""
+        generation = manifest["next_generation"]
+        write_snapshot(store, {"generation": generation}, self._snapshot_path(generation))
+        old = manifest["tenants"].get(tenant)
+        manifest["next_generation"] = generation + 1
+        # `source`: fingerprint of the CSV it was loaded from, None for uploads
+        manifest["tenants"][tenant] = {"generation": generation, "source": source}
+
+        tmp_fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{MANIFEST}.")
+        with os.fdopen(tmp_fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_name, self.directory / MANIFEST)
+        os.pwrite(fd, _VERSION.pack(self.version() + 1), 0)
+        if old is not None:
+            # workers that mapped it keep it until they drop the store
+            self._snapshot_path(old["generation"]).unlink(missing_ok=True)
+
+    def version(self) -> int:
+        return _VERSION.unpack_from(self._version)[0]
+
+    def load_csv(self, tenant: str, csv_path: Path) -> None:
+        """Publish `csv_path` as `tenant`, unless that file version already is."""
+        with self._writing() as fd:
+            manifest = self._read_manifest()
+            fingerprint = source_fingerprint(csv_path)
+            current = manifest["tenants"].get(tenant)
+            if current is not None and current["source"] == fingerprint:
+                # another worker loaded it first
+                return
+            # parsed straight into the shared snapshot: the shared directory
+            # is the only copy written (no per-process MOVIE_SNAPSHOT_DIR one)
+            self._publish(fd, manifest, tenant, load_tenant(csv_path), fingerprint)
+
+    def publish(self, tenant: str, store: TenantStore) -> None:
+        """Make a copy of `store` the current version of `tenant` in every worker."""
+        with self._writing() as fd:
+            self._publish(fd, self._read_manifest(), tenant, store, None)
+
+    def add(self, tenant: str, store: TenantStore) -> bool:
+        """Publish a new tenant; False (and no change) if it already exists."""
+        with self._writing() as fd:
+            manifest = self._read_manifest()
+            if tenant in manifest["tenants"]:
+                return False
+            self._publish(fd, manifest, tenant, store, None)
+            return True
+
+    def sync(self, registry: "TenantRegistry") -> None:
+        """Make `registry` hold the current shared tenants, if they changed."""
+        if self.version() == self._synced:
+            return
+        with self._sync_lock:
+            while True:
+                version = self.version()
+                if version == self._synced:
+                    return
+                tenants = self._open_current(version)
+                if tenants is not None:
+                    break
+            registry.replace(tenants)
+            self._synced = version
+
+    def _open_current(self, version: int) -> Optional[Dict[str, TenantStore]]:
+        """Map the manifest's generations; None if a writer changed it meanwhile."""
+        tenants: Dict[str, TenantStore] = {}
+        for tenant, entry in self._read_manifest()["tenants"].items():
+            generation = entry["generation"]
+            store = self._stores.get(generation)
+            if store is None:
+                store = open_snapshot(self._snapshot_path(generation), {"generation": generation}, generation)
+            if store is None:
+                if self.version() != version:
+                    # replaced and removed since the manifest was read
+                    return None
+                raise RuntimeError(f"Shared snapshot of {tenant} (generation {generation}) is unreadable")
+            tenants[tenant] = store
+        self._stores = {store.generation: store for store in tenants.values()}
+        return tenants
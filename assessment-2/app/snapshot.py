@@ -0,0 +1,259 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from app.compact import CompactMovies
+from app.search import SearchIndex
+from app.serialization import JsonFragments
+from app.store import TenantStore, load_tenant
+
+logger = logging.getLogger("assessment-2")
+
+# where tenant snapshots are kept (default: the user's cache directory, not
+# the package, which may be read-only); set MOVIE_SNAPSHOT_DIR="" to turn them off
+_CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+SNAPSHOT_DIR = os.environ.get("MOVIE_SNAPSHOT_DIR", str(_CACHE_HOME / "movie-api" / "snapshots"))
+SNAPSHOT_SUFFIX = ".snapshot"
+
+MAGIC = b"MOVSNAP\x00"
+FORMAT_VERSION = 3
+# magic, length of the JSON header that follows
+_PREAMBLE = struct.Struct("<8sQ")
+# sections start on 8-byte boundaries so int64/float64 views are aligned
+_ALIGN = 8
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _text_bytes(text: str) -> bytes:
+    return text.encode("utf-8", "surrogatepass")
+
+
+def source_fingerprint(path: Path) -> Dict[str, int]:
+    """What a snapshot must have been built from to still be valid."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def snapshot_path(csv_path: Path) -> Optional[Path]:
+    if not SNAPSHOT_DIR:
+        return None
+    # the directory may serve several checkouts: tell same-named CSVs apart
+    where = hashlib.sha1(str(csv_path.resolve().parent).encode()).hexdigest()[:12]
+    return Path(SNAPSHOT_DIR) / f"{csv_path.stem}-{where}{SNAPSHOT_SUFFIX}"
+
+
+class SortedTextIndex(Mapping[str, int]):
+    """String -> position, read from a snapshot without building a dict.
+
+    The strings are a text column (`offsets` into a UTF-8 `blob`); `order`
+    lists one position per distinct string, sorted by the strings' UTF-8
+    bytes. A lookup binary-searches it, reading ~log2(n) strings.
+    Used for tmdb_id -> movie and search term -> term id.
+    """
+
+    def __init__(self, order: Sequence[int], offsets: Sequence[int], blob: memoryview):
+        self.order = order
+        self.offsets = offsets
+        self.blob = blob
+
+    def _text_at(self, pos: int) -> bytes:
+        return bytes(self.blob[self.offsets[pos]:self.offsets[pos + 1]])
+
+    def __getitem__(self, text: str) -> int:
+        key = _text_bytes(text)
+        i = bisect_left(self.order, key, key=self._text_at)
+        if i < len(self.order) and self._text_at(self.order[i]) == key:
+            return self.order[i]
+        raise KeyError(text)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __iter__(self) -> Iterator[str]:
+        for pos in self.order:
+            yield str(self._text_at(pos), "utf-8", "surrogatepass")
+
+
+def _flatten(index: Mapping[Any, Sequence[int]]) -> Tuple[List[list], array]:
+    """Concatenate an index's position lists: ([key, start, stop], ...) + one array."""
+    keys = []
+    positions = array("i")
+    for key, postings in index.items():
+        keys.append([key, len(positions), len(positions) + len(postings)])
+        positions.extend(postings)
+    return keys, positions
+
+
+def write_snapshot(store: TenantStore, fingerprint: Dict[str, int], path: Path) -> None:
+    """Save `store` (built from a source with `fingerprint`) to `path`.
+
+    Layout: magic and header length, a JSON header (source fingerprint,
+    interned values, index keys, section table), then raw sections: the
+    `CompactMovies` columns, the JSON fragments, the genre/cell/year position
+    lists, the sorted id order and the search index. The file is replaced atomically.
+    """
+    movies = store.movies if isinstance(store.movies, CompactMovies) else CompactMovies(store.movies)
+    sections: Dict[str, Any] = movies.buffers()
+    sections["json.offsets"] = store.json.offsets
+    sections["json.blob"] = store.json.blob
+    genres, sections["genre.postings"] = _flatten(store.by_genre)
+    genre_cells, sections["genre_cell.postings"] = _flatten(store.by_genre_cell)
+    years, sections["year.postings"] = _flatten(store.by_year)
+    ordered_ids = sorted(store.by_id.items(), key=lambda item: _text_bytes(item[0]))
+    sections["id.order"] = array("i", (pos for _, pos in ordered_ids))
+
+    search = store.search_index
+    # term ids follow the sorted term order, so the terms column is the sorted order
+    term_offsets = array("q", [0])
+    term_blob = bytearray()
+    for term in sorted(search.terms, key=search.terms.__getitem__):
+        term_blob += _text_bytes(term)
+        term_offsets.append(len(term_blob))
+    sections["search.terms.offsets"] = term_offsets
+    sections["search.terms.blob"] = term_blob
+    sections["search.starts"] = search.starts
+    sections["search.docs"] = search.docs
+    sections["search.impacts"] = search.impacts
+    sections["search.by_impact"] = search.by_impact
+
+    table: Dict[str, list] = {}
+    offset = 0
+    for name, data in sections.items():
+        # memoryview format, not array typecode: the sections of a mapped store are views
+        view = memoryview(data)
+        table[name] = [offset, view.nbytes, view.format]
+        offset = _aligned(offset + view.nbytes)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "source": fingerprint,
+        "interned": movies.interned_values(),
+        "genres": genres,
+        "genre_cells": genre_cells,
+        "years": years,
+        "sections": table,
+    }).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, len(header)))
+            f.write(header)
+            data_start = _aligned(f.tell())
+            for name, data in sections.items():
+                f.seek(data_start + table[name][0])
+                f.write(data)
+            f.truncate(data_start + offset)
+        # readers that mapped the previous file keep their (unlinked) copy
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def open_snapshot(
+    path: Path,
+    fingerprint: Dict[str, int],
+    generation: Optional[int] = None,
+) -> Optional[TenantStore]:
+    """Map the snapshot at `path` as a store, or None if it is missing,
+    unreadable or was built from a different source.
+
+    Only the header is parsed: columns, fragments and indexes are views
+    over the mapping, paged in by the OS as requests touch them.
+    """
+    try:
+        with path.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # ValueError: an empty file cannot be mapped
+        return None
+
+    try:
+        magic, header_len = _PREAMBLE.unpack_from(mapped)
+        if magic != MAGIC:
+            return None
+        header = json.loads(mapped[_PREAMBLE.size:_PREAMBLE.size + header_len])
+    except (struct.error, ValueError):
+        return None
+    if header.get("version") != FORMAT_VERSION or header.get("source") != fingerprint:
+        return None
+
+    view = memoryview(mapped)
+    data_start = _aligned(_PREAMBLE.size + header_len)
+    buffers: Dict[str, Any] = {}
+    for name, (offset, size, typecode) in header["sections"].items():
+        start = data_start + offset
+        if start + size > len(view):
+            # truncated file
+            return None
+        section = view[start:start + size]
+        buffers[name] = section if typecode == "B" else section.cast(typecode)
+
+    genre_postings = buffers["genre.postings"]
+    genre_cell_postings = buffers["genre_cell.postings"]
+    year_postings = buffers["year.postings"]
+    return TenantStore.from_indexes(
+        movies=CompactMovies.from_buffers(buffers, header["interned"]),
+        by_id=SortedTextIndex(buffers["id.order"], buffers["tmdb_id.offsets"], buffers["tmdb_id.blob"]),
+        by_genre={token: genre_postings[start:stop] for token, start, stop in header["genres"]},
+        by_genre_cell={cell: genre_cell_postings[start:stop] for cell, start, stop in header["genre_cells"]},
+        by_year={year: year_postings[start:stop] for year, start, stop in header["years"]},
+        json=JsonFragments.from_buffers(buffers["json.offsets"], buffers["json.blob"]),
+        search_index=SearchIndex.from_buffers(
+            terms=SortedTextIndex(
+                range(len(buffers["search.starts"]) - 1),
+                buffers["search.terms.offsets"],
+                buffers["search.terms.blob"],
+            ),
+            starts=buffers["search.starts"],
+            docs=buffers["search.docs"],
+            impacts=buffers["search.impacts"],
+            by_impact=buffers["search.by_impact"],
+            n_docs=len(buffers["year"]),
+        ),
+        generation=generation,
+    )
+
+
+def open_tenant(csv_path: Path) -> TenantStore:
+    """Load a tenant CSV, through its snapshot when one is up to date.
+
+    Otherwise the CSV is parsed and a fresh snapshot written for the next
+    start (or the next worker); failing to write it only logs a warning.
+    """
+    path = snapshot_path(csv_path)
+    if path is None:
+        return load_tenant(csv_path)
+
+    # taken before parsing: a CSV edited meanwhile leaves the snapshot stale
+    fingerprint = source_fingerprint(csv_path)
+    start = time.perf_counter()
+    store = open_snapshot(path, fingerprint)
+    if store is not None:
+        logger.info(f"{csv_path.name}: mapped snapshot ({len(store)} movies) in {time.perf_counter() - start:.3f}s")
+        return store
+
+    store = load_tenant(csv_path)
+    logger.info(
+        f"{csv_path.name}: parsed CSV ({len(store)} movies, search index "
+        f"{store.search_index.build_seconds:.3f}s) in {time.perf_counter() - start:.3f}s"
+    )
+    try:
+        write_snapshot(store, fingerprint, path)
+    except OSError as e:
+        logger.warning(f"Could not write snapshot {path}: {e}")
+    return store
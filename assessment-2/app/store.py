@@ -0,0 +1,322 @@
+import os
+import unicodedata
+from bisect import bisect_left
+from heapq import merge
+from itertools import count, islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from app.compact import CompactMovies
+from app.data_loader import iter_movies_from_csv
+from app.models import Movie
+from app.search import SearchIndex
+from app.serialization import JsonFragments, movie_json
+
+# "dataclass": one Movie object per row; "compact": column arrays (app.compact)
+STORE_LAYOUTS = ("dataclass", "compact")
+STORE_LAYOUT = os.environ.get("MOVIE_STORE_LAYOUT", "dataclass")
+if STORE_LAYOUT not in STORE_LAYOUTS:
+    raise ValueError(f"MOVIE_STORE_LAYOUT must be one of {STORE_LAYOUTS}, got {STORE_LAYOUT!r}")
+
+# movies per chunk of an NDJSON stream
+NDJSON_CHUNK = 256
+
+# every built store gets a new number; cursors are only valid for their store
+_generations = count(1)
+
+
+def normalize_genre(value: str) -> str:
+    """Canonical form of a genre cell or query: NFC and case-folded.
+
+    Not trimmed: like the old substring filter, " phim" only matches where
+    a space comes before "phim".
+    """
+    return unicodedata.normalize("NFC", value).casefold()
+
+
+def genre_tokens(genre: str) -> List[str]:
+    """Split a CSV genre cell like "Phim Hài, Phim Nhạc" into normalized, trimmed tokens."""
+    return [token for token in (normalize_genre(part).strip() for part in genre.split(",")) if token]
+
+
+def _intersect(a: Iterable[int], b: Sequence[int]) -> Iterator[int]:
+    """Lazily intersect ascending positions `a` with the sorted sequence `b`.
+
+    Each step bisects forward into `b`, so taking the first k matches costs
+    O(consumed * log(len(b))), not a pass over both lists.
+    """
+    lo = 0
+    for pos in a:
+        lo = bisect_left(b, pos, lo)
+        if lo == len(b):
+            return
+        if b[lo] == pos:
+            yield pos
+
+
+def _contains(postings: Sequence[int], pos: int) -> bool:
+    i = bisect_left(postings, pos)
+    return i < len(postings) and postings[i] == pos
+
+
+def _tail(postings: Sequence[int], start: int) -> Iterator[int]:
+    """Positions >= start of a sorted sequence, without walking the skipped part."""
+    return map(postings.__getitem__, range(bisect_left(postings, start), len(postings)))
+
+
+def _union(lists: Iterable[Iterable[int]]) -> Iterator[int]:
+    """Lazy, de-duplicated union of ascending position iterables."""
+    last = -1
+    for pos in merge(*lists):
+        if pos != last:
+            yield pos
+            last = pos
+
+
+class TenantStore:
+    """Movies of one tenant plus the lookup indexes built once at load time.
+
+    `movies` is any read-only sequence of movies: a `List[Movie]` or a
+    `CompactMovies`. Indexes hold positions into it, kept in ascending
+    order, so filtered results come back in the original CSV order:
+
+    - `by_id`: tmdb_id -> position (first occurrence wins)
+    - `by_genre`: normalized genre token -> positions
+    - `by_genre_cell`: normalized whole genre cell -> positions
+    - `by_year`: year -> positions
+    - `search_index`: full-text index over titles and overview (app.search)
+
+    `json` holds every movie already serialized, so endpoints answer with
+    raw bytes instead of re-encoding movies per request. `generation`
+    identifies this build of the data (see pagination cursors).
+    """
+
+    def __init__(self, movies: Sequence[Movie]):
+        self.generation = next(_generations)
+        self.movies = movies
+        self.by_id: Dict[str, int] = {}
+        self.by_genre: Dict[str, List[int]] = {}
+        self.by_genre_cell: Dict[str, List[int]] = {}
+        self.by_year: Dict[int, List[int]] = {}
+        self.json = JsonFragments()
+        self.search_index = SearchIndex()
+
+        for pos, movie in enumerate(movies):
+            self.json.append(movie_json(movie))
+            self.search_index.add(movie)
+            self.by_id.setdefault(movie.tmdb_id, pos)
+            self.by_genre_cell.setdefault(normalize_genre(movie.genre or ""), []).append(pos)
+            for token in genre_tokens(movie.genre or ""):
+                postings = self.by_genre.setdefault(token, [])
+                # a token repeated within one cell is indexed once
+                if not postings or postings[-1] != pos:
+                    postings.append(pos)
+            if movie.year is not None:
+                self.by_year.setdefault(movie.year, []).append(pos)
+
+        self.json.freeze()
+        self.search_index.freeze()
+
+    @classmethod
+    def from_indexes(
+        cls,
+        movies: Sequence[Movie],
+        by_id: Mapping[str, int],
+        by_genre: Dict[str, Sequence[int]],
+        by_genre_cell: Dict[str, Sequence[int]],
+        by_year: Dict[int, Sequence[int]],
+        json: JsonFragments,
+        search_index: SearchIndex,
+        generation: Optional[int] = None,
+    ) -> "TenantStore":
+        """A store over indexes built elsewhere (see app.snapshot), skipping the build.
+
+        Position lists may be any ascending sequence of ints, e.g. memoryviews.
+        `generation` is for stores numbered elsewhere (see app.shared).
+        """
+        store = cls.__new__(cls)
+        store.generation = next(_generations) if generation is None else generation
+        store.movies = movies
+        store.by_id = by_id
+        store.by_genre = by_genre
+        store.by_genre_cell = by_genre_cell
+        store.by_year = by_year
+        store.json = json
+        store.search_index = search_index
+        return store
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def get(self, tmdb_id: str) -> Optional[Movie]:
+        pos = self.by_id.get(tmdb_id)
+        return None if pos is None else self.movies[pos]
+
+    def get_json(self, tmdb_id: str) -> Optional[bytes]:
+        pos = self.by_id.get(tmdb_id)
+        return None if pos is None else self.json[pos]
+
+    def genre_postings(self, genre: str) -> List[Sequence[int]]:
+        """Position lists of the genre tokens containing `genre`.
+
+        Matches the old substring filter over the whole genre cell ("hài"
+        finds "Phim Hài"); only distinct tokens or cells are scanned, never
+        the movies. A query within one genre is matched against the tokens.
+        One that may cross a token's bounds, a comma or leading or trailing
+        whitespace (" phim" finds "Phim Hài, Phim Nhạc"), is matched against
+        the whole cells.
+        """
+        query = normalize_genre(genre)
+        if "," in query or query != query.strip():
+            return [postings for cell, postings in self.by_genre_cell.items() if query in cell]
+        return [postings for token, postings in self.by_genre.items() if query in token]
+
+    def filter_positions(
+        self,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        start: int = 0,
+    ) -> Iterable[int]:
+        """Ascending positions >= `start` of the matching movies, produced lazily."""
+        if not genre and not year:
+            return range(start, len(self.movies))
+
+        positions: Optional[Iterable[int]] = None
+        if genre:
+            matches = self.genre_postings(genre)
+            positions = matches[0] if len(matches) == 1 else _union(_tail(m, start) for m in matches)
+        if year:
+            by_year = self.by_year.get(year, [])
+            if positions is None:
+                positions = by_year
+            elif isinstance(positions, Sequence):
+                # walk the shorter list, bisect into the longer one
+                small, large = sorted((positions, by_year), key=len)
+                positions = _intersect(_tail(small, start), large)
+            else:
+                positions = _intersect(positions, by_year)
+        if isinstance(positions, Sequence):
+            positions = _tail(positions, start)
+        return positions
+
+    def _matcher(self, genre: Optional[str], year: Optional[int]) -> Optional[Callable[[int], bool]]:
+        """Membership test for the `genre`/`year` filters, None when unfiltered."""
+        if not genre and not year:
+            return None
+        genre_lists = self.genre_postings(genre) if genre else None
+        year_list = self.by_year.get(year, []) if year else None
+
+        def matches(pos: int) -> bool:
+            if year_list is not None and not _contains(year_list, pos):
+                return False
+            return genre_lists is None or any(_contains(postings, pos) for postings in genre_lists)
+
+        return matches
+
+    def _candidates(self, genre: Optional[str], year: Optional[int]) -> Optional[Sequence[int]]:
+        """Shortest single position list that holds every filtered match, if any."""
+        lists: List[Sequence[int]] = []
+        if year:
+            lists.append(self.by_year.get(year, []))
+        if genre:
+            matches = self.genre_postings(genre)
+            # several matching tokens would need a union; skip those
+            if len(matches) <= 1:
+                lists.append(matches[0] if matches else [])
+        return min(lists, key=len) if lists else None
+
+    def search(
+        self,
+        query: str,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """Positions of the movies matching `query` and the filters, best first."""
+        return self.search_index.search(query, limit, self._matcher(genre, year), self._candidates(genre, year))
+
+    def filter(
+        self,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movie]:
+        if not genre and not year:
+            return self.movies[:limit]
+        # the positions are lazy, so a limit stops the work early
+        return [self.movies[pos] for pos in islice(self.filter_positions(genre, year), limit)]
+
+    def page_positions(
+        self,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        limit: Optional[int] = None,
+        start: int = 0,
+        search: Optional[str] = None,
+    ) -> Tuple[Iterable[int], Optional[int]]:
+        """Positions of the movies on the page starting at `start`, plus the
+        position the next page starts at (None on the last page). Produced
+        lazily when there is no `limit`, so there is no next page.
+
+        With `search`, results are ranked and `start` is a rank instead.
+        """
+        if search:
+            ranked = self.search(search, genre, year, None if limit is None else start + limit + 1)
+            stop = len(ranked) if limit is None else start + limit
+            return ranked[start:stop], stop if stop < len(ranked) else None
+        if limit is None:
+            return self.filter_positions(genre, year, start), None
+        # one look-ahead match tells whether another page exists
+        positions = list(islice(self.filter_positions(genre, year, start), limit + 1))
+        next_start = positions.pop() if len(positions) > limit else None
+        return positions, next_start
+
+    def page_json(
+        self,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        limit: Optional[int] = None,
+        start: int = 0,
+        search: Optional[str] = None,
+    ) -> Tuple[bytes, Optional[int]]:
+        """`page_positions` as a ready JSON array body, plus the next page's start."""
+        if not genre and not year and not search:
+            stop = len(self.movies) if limit is None else start + limit
+            next_start = stop if stop < len(self.movies) else None
+            return self.json.run_array(start, stop), next_start
+        positions, next_start = self.page_positions(genre, year, limit, start, search)
+        return self.json.array(positions), next_start
+
+    def page_ndjson(
+        self,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        limit: Optional[int] = None,
+        start: int = 0,
+        search: Optional[str] = None,
+    ) -> Tuple[Iterator[bytes], Optional[int]]:
+        """`page_positions` as newline-delimited JSON chunks of NDJSON_CHUNK
+        movies, plus the next page's start.
+
+        The next page is known before the first chunk is produced, so it can
+        go in the response headers; the movies are serialized as the chunks
+        are consumed.
+        """
+        positions, next_start = self.page_positions(genre, year, limit, start, search)
+        return self._ndjson_chunks(iter(positions)), next_start
+
+    def _ndjson_chunks(self, positions: Iterator[int]) -> Iterator[bytes]:
+        while chunk := list(islice(positions, NDJSON_CHUNK)):
+            yield b"\n".join(self.json.fragment(pos) for pos in chunk) + b"\n"
+
+
+def build_tenant(movies: Iterable[Movie], layout: str = STORE_LAYOUT) -> TenantStore:
+    """Index `movies` into a store using the configured memory layout."""
+    if layout == "compact":
+        return TenantStore(CompactMovies(movies))
+    return TenantStore(list(movies))
+
+
+def load_tenant(path: Path, layout: str = STORE_LAYOUT) -> TenantStore:
+    # streams rows, so the compact layout never holds every Movie at once
+    return build_tenant(iter_movies_from_csv(path), layout)
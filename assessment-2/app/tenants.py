@@ -0,0 +1,204 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+
+from app.shared import SharedTenants
+from app.snapshot import open_tenant, snapshot_path, source_fingerprint
+from app.store import TenantStore
+
+logger = logging.getLogger("assessment-2")
+
+# seconds between scans of the CSV folder; 0 (default) disables the watcher
+WATCH_INTERVAL = float(os.environ.get("MOVIE_CSV_WATCH_INTERVAL", "0"))
+
+
+class TenantRegistry(Mapping[str, TenantStore]):
+    """Tenant name -> store, updated copy-on-write.
+
+    Stores are never modified after they are built, and the mapping itself
+    is replaced, not mutated: a writer copies it, changes the copy and
+    publishes it in one assignment under a lock. A request that looked up
+    its store keeps reading that version even if a reload lands meanwhile,
+    and iterating the tenants never races with a writer.
+
+    Callbacks registered with `on_replaced` get every store that stops
+    being current, once the new mapping is published.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tenants: Mapping[str, TenantStore] = MappingProxyType({})
+        self._replaced_callbacks: List[Callable[[TenantStore], None]] = []
+
+    def __getitem__(self, tenant: str) -> TenantStore:
+        return self._tenants[tenant]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tenants)
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def on_replaced(self, callback: Callable[[TenantStore], None]) -> None:
+        self._replaced_callbacks.append(callback)
+
+    def _replaced(self, stores: List[TenantStore]) -> None:
+        for store in stores:
+            for callback in self._replaced_callbacks:
+                callback(store)
+
+    def publish(self, tenant: str, store: TenantStore) -> None:
+        """Make `store` the current version of `tenant`."""
+        with self._lock:
+            old = self._tenants.get(tenant)
+            self._tenants = MappingProxyType({**self._tenants, tenant: store})
+        if old is not None and old is not store:
+            self._replaced([old])
+
+    def add(self, tenant: str, store: TenantStore) -> bool:
+        """Publish a new tenant; False (and no change) if it already exists."""
+        with self._lock:
+            if tenant in self._tenants:
+                return False
+            self._tenants = MappingProxyType({**self._tenants, tenant: store})
+            return True
+
+    def replace(self, tenants: Mapping[str, TenantStore]) -> None:
+        """Swap in a whole new set of tenants."""
+        with self._lock:
+            old = self._tenants
+            self._tenants = MappingProxyType(dict(tenants))
+        kept = {id(store) for store in tenants.values()}
+        self._replaced([store for store in old.values() if id(store) not in kept])
+
+
+def _write_tenant_snapshot(csv_path: Path) -> None:
+    # runs in the watcher's child process
+    open_tenant(csv_path)
+
+
+def _load_shared_csv(directory: Path, tenant: str, csv_path: Path) -> None:
+    # runs in the watcher's child process
+    SharedTenants(directory).load_csv(tenant, csv_path)
+
+
+class CsvWatcher:
+    """Polls a folder of tenant CSVs (`<tenant>.csv`) and reloads changed ones.
+
+    A new or modified file is rebuilt once its size and mtime have been the
+    same for two scans (so half-written files are skipped), then published
+    to the registry. With snapshots enabled the CSV is parsed in a child
+    process that writes the tenant's snapshot, and this process only maps
+    it, so request threads don't compete with the parse for the GIL.
+
+    With `shared` tenants, the child publishes to the shared directory
+    instead; when every worker watches the folder, the first one to get
+    there loads the file and the others just map it.
+    """
+
+    def __init__(
+        self,
+        registry: TenantRegistry,
+        directory: Path,
+        interval: float,
+        shared: Optional[SharedTenants] = None,
+    ):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self.shared = shared
+        self._loaded: Dict[str, Dict[str, int]] = {}
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def mark_loaded(self, tenant: str, fingerprint: Dict[str, int]) -> None:
+        """Record the CSV version a tenant was loaded from elsewhere (e.g. at startup)."""
+        self._loaded[tenant] = fingerprint
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+    def _in_child(self, fn: Callable[..., None], *args) -> bool:
+        """Run `fn` in the child process; False if there is none or it died."""
+        if self._pool is None:
+            return False
+        try:
+            self._pool.submit(fn, *args).result()
+            return True
+        except BrokenProcessPool:
+            logger.warning("Watcher: child process died; loading in this process")
+            self._pool = self._new_pool()
+            return False
+
+    def _reload(self, tenant: str, csv_path: Path) -> TenantStore:
+        if self.shared is not None:
+            if not self._in_child(_load_shared_csv, self.shared.directory, tenant, csv_path):
+                self.shared.load_csv(tenant, csv_path)
+            self.shared.sync(self.registry)
+            return self.registry[tenant]
+
+        if snapshot_path(csv_path) is not None:
+            self._in_child(_write_tenant_snapshot, csv_path)
+        # maps the snapshot just written; parses here if it is missing or stale
+        store = open_tenant(csv_path)
+        self.registry.publish(tenant, store)
+        return store
+
+    def poll(self) -> List[str]:
+        """Scan once; returns the tenants that were reloaded."""
+        reloaded = []
+        for csv_path in sorted(self.directory.glob("*.csv")):
+            tenant = csv_path.stem
+            try:
+                fingerprint = source_fingerprint(csv_path)
+            except FileNotFoundError:
+                continue
+            if fingerprint == self._loaded.get(tenant):
+                self._pending.pop(tenant, None)
+                continue
+            if self._pending.get(tenant) != fingerprint:
+                # changed since the last scan: maybe still being written
+                self._pending[tenant] = fingerprint
+                continue
+
+            del self._pending[tenant]
+            # a file that fails to load is not retried until it changes again
+            self._loaded[tenant] = fingerprint
+            start = time.perf_counter()
+            try:
+                store = self._reload(tenant, csv_path)
+            except Exception as e:
+                logger.warning(f"Watcher: could not reload {csv_path.name}: {e}")
+                continue
+            reloaded.append(tenant)
+            logger.info(f"Watcher: reloaded {tenant} ({len(store)} movies) in {time.perf_counter() - start:.3f}s")
+        return reloaded
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Watcher: scan failed")
+
+    def start(self) -> None:
+        self._pool = self._new_pool()
+        self._thread = threading.Thread(target=self._run, name="csv-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._pool is not None:
+            self._pool.shutdown()
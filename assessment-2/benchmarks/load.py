@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.synthetic import GENRES, WORDS, write_synthetic_csv
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+MODES = ("inprocess", "uvicorn")
+# substrings of the synthetic genre cells, as the frontend sends them ("hài")
+GENRE_QUERIES = [genre.split(" ", 1)[1].lower() for genre in GENRES]
+
+# (method, url, httpx request kwargs)
+Request = Tuple[str, str, dict]
+
+
+@dataclass
+class Stats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    seconds: float = 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the latencies, in seconds."""
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def read_scenarios(tenant: str, count: int) -> Dict[str, Callable[[random.Random], Request]]:
+    headers = {"X-Tenant": tenant}
+    return {
+        "get_movies limit=50": lambda rnd: ("GET", "/movies", {"params": {"limit": 50}, "headers": headers}),
+        "get_movies genre+year": lambda rnd: ("GET", "/movies", {
+            "params": {"genre": rnd.choice(GENRE_QUERIES), "year": rnd.randint(1980, 2025), "limit": 50},
+            "headers": headers,
+        }),
+        "get_movies search": lambda rnd: ("GET", "/movies", {
+            "params": {"search": " ".join(rnd.sample(WORDS, 2)), "limit": 20},
+            "headers": headers,
+        }),
+        # synthetic ids are 1000000 + row number
+        "get_movie": lambda rnd: ("GET", f"/movies/{1_000_000 + rnd.randrange(count)}", {"headers": headers}),
+    }
+
+
+def reload_request(tenant: str, csv_bytes: bytes) -> Request:
+    return ("POST", "/reload", {"params": {"tenant": tenant}, "files": {"file": ("movies.csv", csv_bytes, "text/csv")}})
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    next_request: Callable[[random.Random], Request],
+    concurrency: int,
+    total: Optional[int] = None,
+    stop: Optional[asyncio.Event] = None,
+) -> Stats:
+    """Send requests from `concurrency` clients until `total` were sent or `stop` is set."""
+    stats = Stats()
+    sent = 0
+
+    async def client_loop(rnd: random.Random) -> None:
+        nonlocal sent
+        while (total is None or sent < total) and not (stop is not None and stop.is_set()):
+            sent += 1
+            method, url, kwargs = next_request(rnd)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            stats.latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                stats.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(random.Random(i)) for i in range(concurrency)))
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+async def mixed(
+    client: httpx.AsyncClient,
+    reads: List[Callable[[random.Random], Request]],
+    reload: Request,
+    concurrency: int,
+    reloads: int,
+) -> Tuple[Stats, Stats]:
+    """Random reads from `concurrency` clients while one client reloads `reloads` times."""
+    stop = asyncio.Event()
+
+    async def reloader() -> Stats:
+        try:
+            return await drive(client, lambda rnd: reload, 1, total=reloads)
+        finally:
+            stop.set()
+
+    read_stats, reload_stats = await asyncio.gather(
+        drive(client, lambda rnd: rnd.choice(reads)(rnd), concurrency, stop=stop),
+        reloader(),
+    )
+    return read_stats, reload_stats
+
+
+def _process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    for parent in pids:
+        for task in Path(f"/proc/{parent}/task").glob("*"):
+            try:
+                pids.extend(int(child) for child in (task / "children").read_text().split())
+            except OSError:
+                pass
+    return pids
+
+
+def memory_mb(pid: int) -> Optional[Tuple[float, float]]:
+    """(RSS, PSS) in MB of a process and its children; None where /proc is unavailable.
+
+    PSS splits shared pages between the processes mapping them, so it is the
+    fair total for workers sharing mapped snapshots (MOVIE_SHARED_STORE_DIR).
+    """
+    rss = pss = 0
+    for p in _process_tree(pid):
+        try:
+            for line in Path(f"/proc/{p}/smaps_rollup").read_text().splitlines():
+                name, _, value = line.partition(":")
+                if name == "Rss":
+                    rss += int(value.split()[0])
+                elif name == "Pss":
+                    pss += int(value.split()[0])
+        except (OSError, ValueError):
+            if p == pid:
+                return None
+    return rss / 1024, pss / 1024
+
+
+@asynccontextmanager
+async def inprocess_client() -> AsyncIterator[Tuple[httpx.AsyncClient, int]]:
+    """The ASGI app called directly, in this process (no lifespan: no CSV tenants, no watcher)."""
+    from app.main import app
+
+    # one log line per request would swamp the report
+    for name in ("assessment-2", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        yield client, os.getpid()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_client(workers: int) -> AsyncIterator[Tuple[httpx.AsyncClient, int]]:
+    """A local uvicorn server in a subprocess, with this process' environment
+    (so MOVIE_* settings apply), and a client for it.
+    """
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers)],
+        cwd=APP_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None, limits=limits) as client:
+            deadline = time.monotonic() + 120
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+                try:
+                    if (await client.get("/tenants")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start within 120s")
+                await asyncio.sleep(0.2)
+            yield client, server.pid
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def row(mode: str, count: int, scenario: str, stats: Stats) -> str:
+    n = len(stats.latencies)
+    if not n:
+        return f"{mode:>9} {count:>8} {scenario:>24} {0:>8}"
+    ms = [stats.percentile(q) * 1000 for q in (0.5, 0.9, 0.99, 1.0)]
+    return (
+        f"{mode:>9} {count:>8} {scenario:>24} {n:>8} {stats.errors:>6} {n / stats.seconds:>8.1f} "
+        + " ".join(f"{value:>8.2f}" for value in ms)
+    )
+
+
+async def bench_mode(mode: str, args: argparse.Namespace, csvs: Dict[int, bytes]) -> None:
+    client_context = inprocess_client() if mode == "inprocess" else uvicorn_client(args.workers)
+    async with client_context as (client, pid):
+        for count, csv_bytes in csvs.items():
+            tenant = f"bench{count}"
+            # seeded through the API, like a real tenant: create, then upload
+            start = time.perf_counter()
+            await client.post("/tenants", params={"tenant": tenant})
+            method, url, kwargs = reload_request(tenant, csv_bytes)
+            response = await client.request(method, url, **kwargs)
+            if response.status_code != 200:
+                raise RuntimeError(f"Seeding {tenant} failed: {response.status_code} {response.text}")
+            print(f"{mode:>9} {count:>8} {'seed (create + upload)':>24} {time.perf_counter() - start:>8.2f}s")
+
+            scenarios = read_scenarios(tenant, count)
+            for name, next_request in scenarios.items():
+                stats = await drive(client, next_request, args.concurrency, total=args.requests)
+                print(row(mode, count, name, stats))
+
+            reload = reload_request(tenant, csv_bytes)
+            stats = await drive(client, lambda rnd: reload, 1, total=args.reloads)
+            print(row(mode, count, "reload_csv", stats))
+
+            reads, reloads = await mixed(client, list(scenarios.values()), reload, args.concurrency, args.reloads)
+            print(row(mode, count, "mixed: reads", reads))
+            print(row(mode, count, "mixed: reload_csv", reloads))
+
+            memory = memory_mb(pid)
+            if memory is not None:
+                what = "this process" if mode == "inprocess" else "server"
+                print(f"{mode:>9} {count:>8} {'memory':>24}  {what}: rss={memory[0]:.0f}MB pss={memory[1]:.0f}MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Latency percentiles, throughput and memory of the API under concurrent load"
+    )
+    parser.add_argument("--movies", type=int, nargs="+", default=[1_000, 20_000], help="Tenant sizes (default: 1000 20000)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Drive the ASGI app in-process and/or a local uvicorn (default: both)")
+    parser.add_argument("--requests", type=int, default=1_000, help="Requests per read scenario (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (default: 8)")
+    parser.add_argument("--reloads", type=int, default=3, help="Uploads in the reload and mixed scenarios (default: 3)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (default: 1; set MOVIE_SHARED_STORE_DIR for more)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed (default: 0)")
+    args = parser.parse_args()
+    if args.workers > 1 and "uvicorn" in args.modes and not os.environ.get("MOVIE_SHARED_STORE_DIR"):
+        print("warning: without MOVIE_SHARED_STORE_DIR, seeded tenants exist only in the worker that loaded them", file=sys.stderr)
+
+    csvs: Dict[int, bytes] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.movies:
+            path = Path(tmp) / f"{count}.csv"
+            write_synthetic_csv(path, count, args.seed)
+            csvs[count] = path.read_bytes()
+
+    print(
+        f"{'mode':>9} {'movies':>8} {'scenario':>24} {'requests':>8} {'errors':>6} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    for mode in args.modes:
+        asyncio.run(bench_mode(mode, args, csvs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from app.compact import CompactMovies
+from app.store import STORE_LAYOUTS, TenantStore
+from benchmarks.synthetic import iter_synthetic_movies
+
+
+def measure(build: Callable[..., object], *args: object) -> Tuple[object, int, int, float]:
+    """`build(*args)` under tracemalloc; returns (object, retained bytes, peak bytes, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        obj = build(*args)
+        seconds = time.perf_counter() - start
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return obj, retained, peak, seconds
+
+
+def bench(count: int, seed: int) -> List[Tuple[str, int, int, float]]:
+    rows = []
+    for layout in STORE_LAYOUTS:
+        # the generator is lazy: movies are created inside the measurement
+        build_movies = CompactMovies if layout == "compact" else list
+        movies, retained, peak, seconds = measure(build_movies, iter_synthetic_movies(count, seed))
+        rows.append((f"{layout} movies", retained, peak, seconds))
+        # indexes and JSON fragments on top of the movies (already allocated)
+        store, retained, peak, seconds = measure(TenantStore, movies)
+        rows.append((f"{layout} store", retained, peak, seconds))
+        del movies, store
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bytes per movie of the dataclass and compact tenant store layouts"
+    )
+    parser.add_argument("--movies", type=int, nargs="+", default=[10_000, 100_000], help="Tenant sizes (default: 10000 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed (default: 0)")
+    args = parser.parse_args()
+
+    print(f"{'movies':>8} {'structure':>18} {'B/movie':>9} {'peak B/movie':>13} {'build s':>8}")
+    for count in args.movies:
+        for name, retained, peak, seconds in bench(count, args.seed):
+            print(f"{count:>8} {name:>18} {retained / count:>9.0f} {peak / count:>13.0f} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import csv
+import random
+from pathlib import Path
+from typing import Iterator, List
+
+from app.models import Movie
+
+CSV_HEADER = [
+    "Movie Name",
+    "Movie Link",
+    "Fshare Link",
+    "Original Title",
+    "Genre",
+    "Year",
+    "Runtime",
+    "Rating",
+    "Overview",
+    "Poster URL",
+    "Backdrop URL",
+    "TMDB ID",
+]
+GENRES = [
+    "Phim Hài",
+    "Phim Nhạc",
+    "Phim Chính Kịch",
+    "Phim Kinh Dị",
+    "Phim Hành Động",
+    "Phim Hoạt Hình",
+    "Phim Tình Cảm",
+    "Phim Khoa Học Viễn Tưởng",
+    "Phim Phiêu Lưu",
+    "Phim Tài Liệu",
+]
+WORDS = (
+    "người đàn ông phải đối mặt với hàng loạt rắc rối khi trở về gia đình "
+    "cô gái trẻ phát hiện bí mật của thị trấn nhỏ trong đêm Giáng Sinh "
+    "một nhóm bạn bắt đầu cuộc hành trình nguy hiểm để tìm kiếm sự thật "
+    "love family journey secret city night friends danger truth"
+).split()
+
+
+def synthetic_movie(i: int, rnd: random.Random) -> Movie:
+    title = " ".join(rnd.choice(WORDS).capitalize() for _ in range(rnd.randint(2, 5)))
+    year = rnd.randint(1980, 2025)
+    slug = f"phim-{i}-{year}"
+    return Movie(
+        movie_name=f"{title} - {title} - ({year})",
+        movie_link=f"https://thuviencine.com/{slug}-fshare/",
+        fshare_link=f"https://www.fshare.vn/folder/{rnd.getrandbits(48):012X}",
+        original_title=title,
+        genre=", ".join(rnd.sample(GENRES, rnd.randint(1, 3))),
+        year=year,
+        runtime=f"{rnd.randint(70, 180)} phút" if rnd.random() < 0.9 else None,
+        rating=round(rnd.uniform(1, 10), 1),
+        overview=" ".join(rnd.choice(WORDS) for _ in range(rnd.randint(20, 80))).capitalize() + ".",
+        poster_url=f"https://image.tmdb.org/t/p/w500/{rnd.getrandbits(64):016x}.jpg",
+        backdrop_url=f"https://image.tmdb.org/t/p/original/{rnd.getrandbits(64):016x}.jpg",
+        tmdb_id=str(1_000_000 + i),
+    )
+
+
+def iter_synthetic_movies(count: int, seed: int = 0) -> Iterator[Movie]:
+    """Deterministic movies shaped like app/csv/*.csv (Vietnamese titles, multi-genre cells)."""
+    rnd = random.Random(seed)
+    for i in range(count):
+        yield synthetic_movie(i, rnd)
+
+
+def synthetic_movies(count: int, seed: int = 0) -> List[Movie]:
+    return list(iter_synthetic_movies(count, seed))
+
+
+def write_synthetic_csv(path: Path, count: int, seed: int = 0) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for m in iter_synthetic_movies(count, seed):
+            writer.writerow([
+                m.movie_name,
+                m.movie_link,
+                m.fshare_link,
+                m.original_title,
+                m.genre,
+                m.year,
+                m.runtime or "",
+                m.rating,
+                m.overview,
+                m.poster_url,
+                m.backdrop_url,
+                m.tmdb_id,
+            ])
@@ -0,0 +1,34 @@
+from app.cache import QueryCache
+
+PAGE = (b"[]", None)
+
+
+def key(generation: int) -> tuple:
+    return (generation, None, None, None, 50, 0)
+
+
+def test_late_put_for_replaced_generation_is_refused():
+    cache = QueryCache()
+    cache.put(key(1), PAGE)
+    cache.invalidate(1)
+    assert cache.get(key(1)) is None
+
+    # a request that read generation 1 before the reload finishes now
+    cache.put(key(1), PAGE)
+    assert cache.get(key(1)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_retired_generations_are_bounded():
+    cache = QueryCache(max_retired=4)
+    for generation in range(1, 1001):
+        cache.invalidate(generation)
+    assert len(cache._retired) == 4
+
+    cache.put(key(1000), PAGE)
+    cache.put(key(997), PAGE)
+    assert cache.stats()["entries"] == 0
+
+    # forgotten: cached, and aged out like any unused entry
+    cache.put(key(996), PAGE)
+    assert cache.get(key(996)) == PAGE
@@ -0,0 +1,64 @@
+import csv
+import io
+import random
+import tempfile
+
+import pytest
+
+from app.data_loader import UPLOAD_CHUNK, iter_movies_from_upload, iter_upload_lines
+
+HEADER = "Movie Name,Genre,Year,Overview,TMDB ID\r\n"
+
+
+class ReadOnly:
+    """A binary file with nothing but read(): not seekable, no readable()."""
+
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._data.read(size)
+
+
+def spooled(data: bytes) -> tempfile.SpooledTemporaryFile:
+    # what Starlette's UploadFile.file is
+    f = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    f.write(data)
+    f.seek(0)
+    return f
+
+
+@pytest.mark.parametrize("wrap", [spooled, ReadOnly], ids=["spooled", "read-only"])
+def test_upload_with_a_row_spanning_several_chunks(wrap):
+    # one row over more than three chunks: a long name and a long quoted
+    # Overview with embedded line breaks (each field stays under csv's
+    # 131072-character limit)
+    name = "Phim rất dài " * 6_000
+    overview = "Rất hay, đáng xem. " * 6_500 + '\r\n"trích dẫn"\n' + "Hết." * 10
+    quoted = '"' + overview.replace('"', '""') + '"'
+    text = HEADER + f"{name},\"Phim Hài, Phim Nhạc\",2024,{quoted},1\r\nPhim Hai,Phim Hài,2023,Ngắn,2\r\n"
+    data = text.encode("utf-8")
+    assert len(data) > 3 * UPLOAD_CHUNK
+
+    movies = list(iter_movies_from_upload(wrap(data)))
+
+    assert [m.tmdb_id for m in movies] == ["1", "2"]
+    assert movies[0].movie_name == name.strip()
+    assert movies[0].overview == overview.strip()
+    assert movies[0].genre == "Phim Hài, Phim Nhạc"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_lines_match_a_newline_preserving_text_file(chunk_size):
+    rnd = random.Random(chunk_size)
+    pieces = ["a", "é", "Phim Hài", ",", '"x,\ny"', '"q\r\nz"', "\n", "\r\n", "\r", " ", "\x0c", "😀"]
+    for _ in range(500):
+        data = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 40))).encode("utf-8")
+        expected = list(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", newline=""))
+        assert list(iter_upload_lines(ReadOnly(data), chunk_size)) == expected
+        assert list(csv.reader(iter_upload_lines(ReadOnly(data), chunk_size))) == list(csv.reader(expected))
+
+
+def test_invalid_utf8_raises_unicode_decode_error():
+    with pytest.raises(UnicodeDecodeError):
+        list(iter_movies_from_upload(spooled(b"Movie Name,TMDB ID\r\nabc,1\r\n\xe1\xbb")))